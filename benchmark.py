@@ -0,0 +1,443 @@
+import argparse
+from array import array
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from campus_graph import (CampusGraph, DisjointSet, a_star, bidirectional_a_star, dijkstra_spt, k_shortest_paths,
+                          kruskal_mst)
+from contraction import ContractionHierarchy
+from mst import IncrementalMST
+from route_table import RouteTable
+from spatial import SpatialIndex
+
+
+# Benchmarks
+#
+#   python benchmark.py --sizes 100 1000 10000 --out results.json
+#   python benchmark.py --sizes 100 1000 --baseline results.json     # exit 1 on regressions
+#
+# Synthetic maps use NODE_POS-style pixel coordinates (about 70 px between
+# neighbouring buildings, like the real campus) and weights of roughly one unit
+# per 30 px of walking, never shorter than the straight line.
+
+SPACING = 70.0
+PX_PER_UNIT = 30.0
+QUERIES = 20
+
+# Processes for the parallel all-pairs benchmark (skipped on a single core)
+WORKERS = os.cpu_count() or 1
+
+# Largest graphs each benchmark is run on (preprocessing is quadratic or the GUI can't show more)
+LIMITS = {
+    "route_table": 2000,
+    "ch_build": 20000,
+    "ch_query": 20000,
+    "draw_map": 100000,
+}
+
+
+# Generators
+
+def _walk(x1, y1, x2, y2, rng):
+    """Edge weight: straight-line distance in walking units plus a detour of up to 50%."""
+    return round(math.hypot(x2 - x1, y2 - y1) / PX_PER_UNIT * rng.uniform(1.0, 1.5), 1) or 0.1
+
+
+def _build(xs, ys, pairs, rng):
+    pairs = sorted(pairs)
+    us = [u for u, _ in pairs]
+    vs = [v for _, v in pairs]
+    ws = [_walk(xs[u], ys[u], xs[v], ys[v], rng) for u, v in pairs]
+    names = [f"N{i}" for i in range(len(xs))]
+    return CampusGraph.from_edges(names, us, vs, ws, xs, ys)
+
+
+def _connect(n, pairs, xs):
+    """Join every connected component to the next one (ordered by x) so all queries have an answer."""
+    sets = DisjointSet(n)
+    for u, v in pairs:
+        sets.union(u, v)
+    reps = {}
+    for u in range(n):
+        r = sets.find(u)
+        if r not in reps or xs[u] < xs[reps[r]]:
+            reps[r] = u
+    chain = sorted(reps.values(), key=xs.__getitem__)
+    for a, b in zip(chain, chain[1:]):
+        pairs.add((min(a, b), max(a, b)))
+
+
+def _knn_pairs(xs, ys, k, ids=None):
+    """Undirected k-nearest-neighbour pairs among ids (all nodes by default), via a bucket grid."""
+    ids = range(len(xs)) if ids is None else ids
+    if len(ids) < 2:
+        return set()
+    x0, y0 = min(xs[i] for i in ids), min(ys[i] for i in ids)
+    area = max(1.0, (max(xs[i] for i in ids) - x0) * (max(ys[i] for i in ids) - y0))
+    cell = math.sqrt(area * 2 / len(ids))  # ~2 points per cell
+    grid = {}
+    for i in ids:
+        grid.setdefault((int((xs[i] - x0) // cell), int((ys[i] - y0) // cell)), []).append(i)
+    pairs = set()
+    for i in ids:
+        cx, cy = int((xs[i] - x0) // cell), int((ys[i] - y0) // cell)
+        r = 1
+        while True:
+            near = [j for gx in range(cx - r, cx + r + 1) for gy in range(cy - r, cy + r + 1)
+                    for j in grid.get((gx, gy), ()) if j != i]
+            if len(near) >= k or len(near) == len(ids) - 1:
+                break
+            r += 1
+        near.sort(key=lambda j: (xs[j] - xs[i]) ** 2 + (ys[j] - ys[i]) ** 2)
+        for j in near[:k]:
+            pairs.add((min(i, j), max(i, j)))
+    return pairs
+
+
+def grid_graph(n: int, seed: int = 0):
+    """About n nodes on a square street grid with jittered positions and a few missing blocks."""
+    rng = random.Random(seed)
+    side = max(2, round(math.sqrt(n)))
+    xs = array('d', (50 + c * SPACING + rng.uniform(-10, 10) for r in range(side) for c in range(side)))
+    ys = array('d', (50 + r * SPACING + rng.uniform(-10, 10) for r in range(side) for c in range(side)))
+    pairs = set()
+    for r in range(side):
+        for c in range(side):
+            u = r * side + c
+            if c + 1 < side and rng.random() > 0.1:
+                pairs.add((u, u + 1))
+            if r + 1 < side and rng.random() > 0.1:
+                pairs.add((u, u + side))
+    _connect(len(xs), pairs, xs)
+    return _build(xs, ys, pairs, rng)
+
+
+def random_geometric_graph(n: int, seed: int = 0, k: int = 4):
+    """n buildings scattered uniformly, each joined to its k nearest neighbours."""
+    rng = random.Random(seed)
+    side = math.sqrt(n) * SPACING
+    xs = array('d', (50 + rng.uniform(0, side) for _ in range(n)))
+    ys = array('d', (50 + rng.uniform(0, side) for _ in range(n)))
+    pairs = _knn_pairs(xs, ys, k)
+    _connect(n, pairs, xs)
+    return _build(xs, ys, pairs, rng)
+
+
+def clustered_campus_graph(n: int, seed: int = 0, campus_size: int = 50, k: int = 4):
+    """
+    Several campuses of ~campus_size dense buildings each, far apart and linked by
+    a handful of long roads between neighbouring campuses.
+    """
+    rng = random.Random(seed)
+    campuses = max(1, n // campus_size)
+    cols = math.ceil(math.sqrt(campuses))
+    gap = math.sqrt(campus_size) * SPACING * 3
+    xs, ys, members = array('d'), array('d'), []
+    for c in range(campuses):
+        cx, cy = 50 + (c % cols) * gap, 50 + (c // cols) * gap
+        size = campus_size if c < campuses - 1 else n - campus_size * (campuses - 1)
+        start = len(xs)
+        for _ in range(size):
+            xs.append(cx + rng.gauss(0, gap / 8))
+            ys.append(cy + rng.gauss(0, gap / 8))
+        members.append(range(start, len(xs)))
+    pairs = set()
+    for ids in members:
+        pairs |= _knn_pairs(xs, ys, k, ids)
+    # roads: campus c to its right and lower neighbour, between a random building on each
+    for c, ids in enumerate(members):
+        for other in (c + 1 if (c + 1) % cols else None, c + cols):
+            if other is None or other >= campuses:
+                continue
+            a, b = rng.choice(ids), rng.choice(members[other])
+            pairs.add((min(a, b), max(a, b)))
+    _connect(len(xs), pairs, xs)
+    return _build(xs, ys, pairs, rng)
+
+
+GENERATORS = {
+    "grid": grid_graph,
+    "geometric": random_geometric_graph,
+    "clustered": clustered_campus_graph,
+}
+
+
+# Headless rendering
+
+class VirtualCanvas:
+    """
+    Stand-in for tk.Canvas that records items instead of drawing them, so
+    CampusNavigatorApp._draw_map can be timed without a display.
+    """
+    def __init__(self, width: int = 880, height: int = 400):
+        self.options = {"width": width, "height": height}
+        self.items = {}
+        self.ops = 0
+        self._next = 0
+
+    def _create(self, kind, coords, kw):
+        self._next += 1
+        self.ops += 1
+        self.items[self._next] = [kind, list(coords), kw]
+        return self._next
+
+    def create_line(self, *coords, **kw):
+        return self._create("line", coords, kw)
+
+    def create_text(self, *coords, **kw):
+        return self._create("text", coords, kw)
+
+    def create_oval(self, *coords, **kw):
+        return self._create("oval", coords, kw)
+
+    def create_polygon(self, *coords, **kw):
+        return self._create("polygon", coords, kw)
+
+    def coords(self, item, *coords):
+        self.ops += 1
+        self.items[item][1] = list(coords)
+
+    def itemconfigure(self, item, **kw):
+        self.ops += 1
+        self.items[item][2].update(kw)
+
+    def delete(self, *items):
+        for item in items:
+            self.ops += 1
+            self.items.pop(item, None)
+
+    def tag_raise(self, tag):
+        self.ops += 1
+
+    def tag_lower(self, tag):
+        self.ops += 1
+
+    def cget(self, option):
+        return self.options[option]
+
+    def bind(self, *args):
+        pass
+
+
+def _headless_app(graph, spatial: SpatialIndex = None):
+    """CampusNavigatorApp with just the map state, drawing onto a VirtualCanvas."""
+    from main import CampusNavigatorApp
+    app = CampusNavigatorApp.__new__(CampusNavigatorApp)
+    app.graph = graph
+    app.spatial = spatial or SpatialIndex(graph)
+    app.map_canvas = VirtualCanvas()
+    app._init_map_view()
+    return app
+
+
+# Consistency
+#
+# Before timing, the point-to-point searches are checked against plain Dijkstra
+# with some paths closed, including every path around one node so that a goal
+# which is only reachable over closed paths must come back as (None, inf).
+
+def check(g, rng):
+    """Mismatch messages for a_star / bidirectional_a_star vs dijkstra_spt; g is left as it was."""
+    names = g.names
+    cut = rng.randrange(len(g))
+    closed = {(min(cut, v), max(cut, v)) for v, _ in g.adjacency(cut)}
+    closed.update((u, v) for u, v, _ in rng.sample(list(g.edges()), min(QUERIES, g.num_edges // 4)))
+    saved = [(names[u], names[v], g.weight(names[u], names[v])) for u, v in closed]
+    for a, b, _ in saved:
+        g.close_edge(a, b)
+    problems = []
+    try:
+        for _ in range(QUERIES // 4):
+            start = names[rng.randrange(len(g))]
+            dist, _ = dijkstra_spt(g, start)
+            for goal in [names[cut]] + [names[rng.randrange(len(g))] for _ in range(3)]:
+                if goal == start:
+                    continue
+                for search in (a_star, bidirectional_a_star):
+                    path, cost = search(g, start, goal)
+                    if not math.isclose(cost, dist[goal]) or (path is None) != (dist[goal] == math.inf):
+                        found = "no path" if path is None else f"a path of cost {cost}"
+                        problems.append(f"{search.__name__}({start!r}, {goal!r}) found {found}, "
+                                        f"dijkstra {dist[goal]}")
+    finally:
+        for a, b, w in saved:
+            g.set_weight(a, b, w)
+    return problems
+
+
+# Measurement
+
+def _time(fn, repeat: int):
+    """Median wall time of fn() over repeat runs."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def _peak_memory(fn):
+    """Peak Python heap allocated while fn() runs (separate run: tracing slows it down)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _benchmarks(g, rng):
+    """(name, ops, fn) for every benchmark that applies to g; fn runs ops operations."""
+    names = g.names
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(QUERIES)]
+    source = names[0]
+    g.heuristic_scale  # one-off per graph, computed at load time in the app
+
+    def queries(search):
+        return lambda: [search(g, s, t) for s, t in pairs]
+
+    yield "a_star", QUERIES, queries(a_star)
+    yield "bidirectional_a_star", QUERIES, queries(bidirectional_a_star)
+    yield "k_shortest_paths", QUERIES, queries(k_shortest_paths)
+    yield "dijkstra_spt", 1, lambda: dijkstra_spt(g, source)
+    yield "kruskal_mst", 1, lambda: kruskal_mst(g)
+    mst = IncrementalMST(g)
+    edited = [(g.names[u], g.names[v]) for u, v, _ in rng.sample(list(g.edges()), min(QUERIES, g.num_edges // 2))]
+
+    def mst_updates():
+        # close a path and read the MST, then reopen it and read again
+        for a, b in edited:
+            g.close_edge(a, b)
+            mst.result()
+            g.reset_edge(a, b)
+            mst.result()
+    yield "mst_update", 2 * len(edited), mst_updates
+    yield "spatial_build", 1, lambda: SpatialIndex(g)
+    spatial = SpatialIndex(g)
+    points = [(rng.uniform(spatial.x0, spatial.x0 + spatial.cols * spatial.cell),
+               rng.uniform(spatial.y0, spatial.y0 + spatial.rows * spatial.cell)) for _ in range(QUERIES)]
+    yield "spatial_nearest", QUERIES, lambda: [spatial.nearest(x, y) for x, y in points]
+    # one screen-sized (880 x 400) viewport at zoom 1 per point
+    yield "spatial_viewport", QUERIES, lambda: [(spatial.query(x, y, x + 880, y + 400),
+                                                 list(spatial.edges_in(x, y, x + 880, y + 400)))
+                                                for x, y in points]
+    n = len(g)
+    if n <= LIMITS["route_table"]:
+        yield "route_table", 1, lambda: RouteTable.build(g)
+        if WORKERS > 1:
+            yield f"route_table_x{WORKERS}", 1, lambda: RouteTable.build(g, WORKERS)
+    if n <= LIMITS["ch_build"]:
+        yield "ch_build", 1, lambda: ContractionHierarchy.build(g)
+    if n <= LIMITS["ch_query"]:
+        ch = ContractionHierarchy.build(g)
+        yield "ch_query", QUERIES, lambda: [ch.query(s, t) for s, t in pairs]
+    if n <= LIMITS["draw_map"]:
+        try:
+            _headless_app(g, spatial)
+        except ImportError as e:  # GUI module needs tkinter
+            print(f"  draw_map skipped: {e}", file=sys.stderr)
+            return
+        path = a_star(g, *pairs[0])[0]
+
+        def draw():
+            app = _headless_app(g, spatial)
+            app._draw_map(path=path)
+            app._set_view(1.5, (-100.0, -100.0))  # one zoom/pan redraw
+        yield "draw_map", 1, draw
+
+
+def run(sizes, generators, repeat: int = 3, seed: int = 0, memory: bool = True):
+    results = []
+    for gen in generators:
+        for size in sizes:
+            t0 = time.perf_counter()
+            g = GENERATORS[gen](size, seed=seed)
+            print(f"{gen} n={len(g)} m={g.num_edges} (generated in {time.perf_counter() - t0:.2f}s)",
+                  file=sys.stderr)
+            problems = check(g, random.Random(seed))
+            for p in problems:
+                print(f"  MISMATCH {p}", file=sys.stderr)
+            if problems:
+                raise SystemExit(f"{gen} n={len(g)}: searches disagree with Dijkstra, not timing them")
+            for name, ops, fn in _benchmarks(g, random.Random(seed)):
+                seconds = _time(fn, repeat)
+                peak = _peak_memory(fn) if memory else None
+                results.append({"generator": gen, "size": size, "nodes": len(g), "edges": g.num_edges,
+                                "algorithm": name, "ops": ops, "seconds": seconds,
+                                "per_op": seconds / ops, "peak_bytes": peak})
+                mem = f"{peak / 1024:10.0f} KiB" if peak is not None else ""
+                print(f"  {name:22s} {seconds * 1000:10.2f} ms {mem}", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold: float):
+    """Rows slower (or hungrier) than baseline by more than threshold (0.25 = 25%)."""
+    old = {(r["generator"], r["size"], r["algorithm"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        b = old.get((r["generator"], r["size"], r["algorithm"]))
+        if b is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if r.get(metric) is None or not b.get(metric):
+                continue
+            ratio = r[metric] / b[metric]
+            if ratio > 1 + threshold:
+                regressions.append({"generator": r["generator"], "size": r["size"],
+                                    "algorithm": r["algorithm"], "metric": metric,
+                                    "baseline": b[metric], "current": r[metric], "ratio": ratio})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the campus graph algorithms on synthetic maps.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="approximate node counts (up to 1000000)")
+    parser.add_argument("--generators", nargs="+", choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark (median is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak-memory runs")
+    parser.add_argument("--out", help="write results as JSON to this file ('-' for stdout)")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a result counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.generators, args.repeat, args.seed, memory=not args.no_memory)
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "time": datetime.datetime.now().isoformat(timespec="seconds"),
+                 "repeat": args.repeat, "seed": args.seed},
+        "results": results,
+    }
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        report["regressions"] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['generator']} n={r['size']} {r['algorithm']} {r['metric']}: "
+                  f"{r['baseline']:.4g} -> {r['current']:.4g} (x{r['ratio']:.2f})", file=sys.stderr)
+        if not regressions:
+            print(f"no regressions beyond {args.threshold:.0%}", file=sys.stderr)
+        status = 1 if regressions else 0
+    if args.out == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
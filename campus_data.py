@@ -0,0 +1,48 @@
+import os
+
+from campus_graph import CampusGraph
+from campus_map import open_map
+
+
+# Data: Campus Graph + Positions
+
+CAMPUS_GRAPH = {
+    'Front Gate': {'Library': 2, 'Canteen': 4, 'Admin': 3},
+    'Admin': {'Front Gate': 3, 'Library': 2, 'Auditorium': 4, 'Research Block': 5},
+    'Library': {'Front Gate': 2, 'Admin': 2, 'Hostel': 3, 'Lab': 4, 'Research Block': 3},
+    'Hostel': {'Library': 3, 'Lab': 2, 'Sports Complex': 5, 'Parking': 6},
+    'Canteen': {'Front Gate': 4, 'Lab': 3, 'Cultural Center': 4},
+    'Lab': {'Library': 4, 'Hostel': 2, 'Canteen': 3, 'Ground': 5, 'Auditorium': 6, 'Research Block': 4},
+    'Ground': {'Lab': 5, 'Sports Complex': 3, 'Parking': 4, 'Back Gate': 4},
+    'Sports Complex': {'Hostel': 5, 'Ground': 3, 'Parking': 2, 'Back Gate': 5},
+    'Auditorium': {'Admin': 4, 'Lab': 6, 'Cultural Center': 2},
+    'Cultural Center': {'Canteen': 4, 'Auditorium': 2, 'Parking': 5},
+    'Parking': {'Ground': 4, 'Sports Complex': 2, 'Cultural Center': 5, 'Hostel': 6, 'Back Gate': 3},
+    'Research Block': {'Library': 3, 'Lab': 4, 'Admin': 5},
+    'Back Gate': {'Parking': 3, 'Ground': 4, 'Sports Complex': 5}
+}
+
+NODE_POS = {
+    'Front Gate': (60, 180),
+    'Admin': (170, 130),
+    'Library': (250, 60),
+    'Hostel': (420, 40),
+    'Research Block': (330, 100),
+    'Lab': (420, 180),
+    'Canteen': (250, 300),
+    'Ground': (550, 230),
+    'Sports Complex': (620, 90),
+    'Auditorium': (500, 130),
+    'Cultural Center': (400, 330),
+    'Parking': (620, 280),
+    'Back Gate': (740, 200)
+}
+
+# Map file to use instead of the built-in campus above (.cmap, .json or .csv, see campus_map.py)
+MAP_FILE = os.environ.get("CAMPUS_MAP")
+
+# Node positions (name,x,y) to go with a CSV edge list in CAMPUS_MAP; the GUI needs them
+MAP_NODES = os.environ.get("CAMPUS_MAP_NODES")
+
+# Integer-indexed CSR form used by all algorithms (names interned once)
+CAMPUS = open_map(MAP_FILE, MAP_NODES) if MAP_FILE else CampusGraph.from_dict(CAMPUS_GRAPH, NODE_POS)
@@ -0,0 +1,748 @@
+from array import array
+from collections import deque
+import hashlib
+import heapq
+import math
+
+import metrics
+
+# Weight of a closed path: searches never relax it, edges() skips it
+CLOSED = float('inf')
+
+# Weight edits remembered for incremental cache repair (older caches rebuild)
+CHANGE_LOG_SIZE = 256
+
+
+def numpy_required(what: str):
+    """
+    The numpy module, or an ImportError naming what needs it. Imported on first
+    use (optional, and slow to import) so the GUI, CLI and server start without it.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(f"numpy is required for {what}") from None
+    return numpy
+
+
+# Graph Store
+
+def _simple(offsets, neighbors, weights):
+    """CSR arrays without self-loops and with one (the lightest) entry per neighbour."""
+    n = len(offsets) - 1
+    bad = set()
+    for a in range(n):
+        adj = neighbors[offsets[a]:offsets[a + 1]]
+        if a in adj or len(set(adj)) != len(adj):
+            bad.add(a)
+    if not bad:
+        return offsets, neighbors, weights
+    new_offsets, new_neighbors, new_weights = array('q', [0]), array('i'), array('d')
+    for a in range(n):
+        lo, hi = offsets[a], offsets[a + 1]
+        if a in bad:
+            best = {}
+            for k in range(lo, hi):
+                v, w = neighbors[k], weights[k]
+                if v != a and w < best.get(v, float('inf')):
+                    best[v] = w
+            new_neighbors.extend(best)
+            new_weights.extend(best.values())
+        else:
+            new_neighbors.extend(neighbors[lo:hi])
+            new_weights.extend(weights[lo:hi])
+        new_offsets.append(len(new_neighbors))
+    return new_offsets, new_neighbors, new_weights
+
+
+class CampusGraph:
+    """
+    Compact integer-indexed graph in compressed-sparse-row (CSR) form.
+    Node names are interned to ids 0..n-1; the neighbours of node u are
+    neighbors[offsets[u]:offsets[u+1]] with matching weights.
+    Usage:
+        g = CampusGraph.from_dict(CAMPUS_GRAPH, NODE_POS)
+        for v, w in g.adjacency(g.index['Library']): ...
+    Undirected maps are stored with both directions, like the dict form.
+    """
+    def __init__(self, names, offsets, neighbors, weights, xs=None, ys=None, index=None):
+        if index is None:
+            names = list(names)
+            index = {name: i for i, name in enumerate(names)}
+        self.names = names            # list, or a lazy sequence with its index (campus_map)
+        self.index = index            # name -> id
+        self.offsets = offsets        # array('q'), len n + 1
+        self.neighbors = neighbors    # array('i'), len = directed edge count
+        self.weights = weights        # array('d'), parallel to neighbors
+        self.xs = xs                  # array('d') or None when no coordinates
+        self.ys = ys
+        self.version = 0              # bump on any in-place edit so caches can tell
+        self._scale = None
+        self._symmetric = None        # every a->b has a b->a of the same weight (see symmetric)
+        self._base = None             # weights as built, kept once edits start
+        self._changes = deque(maxlen=CHANGE_LOG_SIZE)  # (version, u, v, old weight)
+
+    @classmethod
+    def from_dict(cls, graph: dict, pos: dict = None):
+        """Build from a dict-of-dicts adjacency map (+ optional {name: (x, y)})."""
+        names = list(graph)
+        index = {name: i for i, name in enumerate(names)}
+        for u in graph:
+            for v in graph[u]:
+                if v not in index:
+                    index[v] = len(names)
+                    names.append(v)
+        offsets, neighbors, weights = array('q', [0]), array('i'), array('d')
+        for u in names:
+            adj = graph.get(u, {})
+            neighbors.extend(index[v] for v in adj)
+            weights.extend(adj.values())
+            offsets.append(len(neighbors))
+        xs = ys = None
+        if pos is not None and all(u in pos for u in names):
+            xs = array('d', (pos[u][0] for u in names))
+            ys = array('d', (pos[u][1] for u in names))
+        return cls(names, offsets, neighbors, weights, xs, ys)
+
+    @classmethod
+    def from_edges(cls, names, us, vs, ws, xs=None, ys=None):
+        """
+        Build straight from parallel undirected edge columns (u_id, v_id, weight),
+        e.g. generated or loaded maps too big for a dict-of-dicts.
+        Each edge is stored in both directions. Self-loops are dropped and
+        repeated a-b rows collapse to the cheapest one (a path has one weight).
+        """
+        n = len(names)
+        offsets = array('q', bytes(8 * (n + 1)))
+        for u, v in zip(us, vs):
+            offsets[u + 1] += 1
+            offsets[v + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        m = offsets[n]
+        neighbors, weights = array('i', bytes(4 * m)), array('d', bytes(8 * m))
+        cursor = offsets[:-1]
+        for u, v, w in zip(us, vs, ws):
+            k = cursor[u]
+            neighbors[k], weights[k] = v, w
+            cursor[u] = k + 1
+            k = cursor[v]
+            neighbors[k], weights[k] = u, w
+            cursor[v] = k + 1
+        offsets, neighbors, weights = _simple(offsets, neighbors, weights)
+        if xs is not None:
+            xs, ys = array('d', xs), array('d', ys)
+        g = cls(names, offsets, neighbors, weights, xs, ys)
+        g._symmetric = True  # both directions stored above
+        return g
+
+    def __getstate__(self):
+        # memory-mapped graphs (campus_map.load_map) travel to worker processes as plain arrays
+        state = self.__dict__.copy()
+        for key, typecode in (("offsets", 'q'), ("neighbors", 'i'), ("weights", 'd'), ("xs", 'd'), ("ys", 'd')):
+            if isinstance(state[key], memoryview):
+                state[key] = array(typecode, state[key].tobytes())
+        if not isinstance(state["names"], list):
+            state["names"] = list(state["names"])
+            state["index"] = {name: i for i, name in enumerate(state["names"])}
+        return state
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    @property
+    def num_edges(self):
+        """Number of stored (directed) adjacency entries."""
+        return len(self.neighbors)
+
+    def adjacency(self, u: int):
+        """(neighbour_id, weight) pairs of node id u."""
+        a, b = self.offsets[u], self.offsets[u + 1]
+        return zip(self.neighbors[a:b], self.weights[a:b])
+
+    def edges(self, closed: bool = False):
+        """
+        Yield each undirected edge once as (u_id, v_id, w) with u_id < v_id.
+        Closed paths are left out unless closed=True.
+        """
+        offsets, neighbors, weights = self.offsets, self.neighbors, self.weights
+        for u in range(len(self.names)):
+            for k in range(offsets[u], offsets[u + 1]):
+                v = neighbors[k]
+                if u < v and (closed or weights[k] != CLOSED):
+                    yield u, v, weights[k]
+
+    # Runtime edits (closures, congestion)
+
+    def _slots(self, u: int, v: int):
+        """Positions of u->v and v->u in neighbors/weights."""
+        offsets, neighbors = self.offsets, self.neighbors
+        slots = [k for a, b in ((u, v), (v, u))
+                 for k in range(offsets[a], offsets[a + 1]) if neighbors[k] == b]
+        if len(slots) != 2:
+            raise KeyError(f"no path between {self.names[u]!r} and {self.names[v]!r}")
+        return slots
+
+    def weight(self, a: str, b: str):
+        """Current weight of the path a-b (CLOSED if closed)."""
+        return self.weights[self._slots(self.index[a], self.index[b])[0]]
+
+    def base_weight(self, a: str, b: str):
+        """Weight of the path a-b as the map was built, before any edits."""
+        weights = self._base if self._base is not None else self.weights
+        return weights[self._slots(self.index[a], self.index[b])[0]]
+
+    def set_weight(self, a: str, b: str, w: float):
+        """
+        Change the weight of the existing path a-b (both directions) in place;
+        CLOSED shuts it. Returns the old weight. The edit bumps version and is
+        logged, so caches can repair themselves via changes_since().
+        """
+        if not w >= 0:
+            raise ValueError("weight must be non-negative")
+        u, v = self.index[a], self.index[b]
+        slots = self._slots(u, v)
+        old = self.weights[slots[0]]
+        if w == old:
+            return old
+        if self._base is None:
+            self._base = array('d', bytes(self.weights))
+        for k in slots:
+            self.weights[k] = w
+        if self._scale is not None and self.xs is not None:
+            # lowering a weight may break admissibility; raising one never does
+            d = math.hypot(self.xs[u] - self.xs[v], self.ys[u] - self.ys[v])
+            if d > 0:
+                self._scale = min(self._scale, w / d)
+        self.version += 1
+        self._changes.append((self.version, u, v, old))
+        return old
+
+    def close_edge(self, a: str, b: str):
+        return self.set_weight(a, b, CLOSED)
+
+    def reset_edge(self, a: str, b: str):
+        """Reopen / uncongest a-b: back to its original weight."""
+        return self.set_weight(a, b, self.base_weight(a, b))
+
+    def changes_since(self, version: int):
+        """
+        [(u_id, v_id, old_weight)] for every edit after version, oldest first,
+        or None if the log no longer reaches back that far.
+        """
+        changes = list(self._changes)
+        if version >= self.version:
+            return []
+        if not changes or changes[0][0] > version + 1:
+            return None
+        return [(u, v, old) for ver, u, v, old in changes if ver > version]
+
+    def pos(self, u: int):
+        return self.xs[u], self.ys[u]
+
+    def digest(self):
+        """SHA-256 hex digest of names, adjacency and weights (changes whenever the map does)."""
+        h = hashlib.sha256()
+        h.update("\0".join(map(str, self.names)).encode("utf-8"))
+        for buf in (self.offsets, self.neighbors, self.weights):
+            h.update(buf.tobytes())
+        return h.hexdigest()
+
+    def snapshot(self):
+        """
+        Copy whose weights later edits don't touch (names and adjacency are shared),
+        for building caches off the Tk thread while the map keeps changing.
+        """
+        g = type(self)(self.names, self.offsets, self.neighbors, array('d', bytes(self.weights)),
+                       self.xs, self.ys, self.index)
+        g.version = self.version
+        g._scale = self._scale
+        g._symmetric = self._symmetric
+        g._base = self._base
+        return g
+
+    @property
+    def symmetric(self):
+        """
+        True for an undirected map: every a->b entry has a b->a twin of the same
+        weight. Checked once (set_weight changes both directions together).
+        """
+        if self._symmetric is None:
+            offsets, neighbors, weights = self.offsets, self.neighbors, self.weights
+            arcs = {(u, neighbors[k]): weights[k]
+                    for u in range(len(self)) for k in range(offsets[u], offsets[u + 1])}
+            self._symmetric = all(arcs.get((v, u)) == w for (u, v), w in arcs.items())
+        return self._symmetric
+
+    @property
+    def heuristic_scale(self):
+        """Cached heuristic_scale() of this graph (0.0 without coordinates)."""
+        if self._scale is None:
+            self._scale = _compute_scale(self)
+        return self._scale
+
+    def to_dict(self):
+        """Back to the dict-of-dicts form (names as keys)."""
+        names = self.names
+        return {names[u]: {names[v]: w for v, w in self.adjacency(u)} for u in range(len(names))}
+
+    def as_numpy(self):
+        """Zero-copy NumPy views: (offsets, neighbors, weights). Requires numpy."""
+        np = numpy_required("CampusGraph.as_numpy()")
+        return (np.frombuffer(self.offsets, dtype=np.int64),
+                np.frombuffer(self.neighbors, dtype=np.int32),
+                np.frombuffer(self.weights, dtype=np.float64))
+
+
+def as_campus_graph(graph, pos: dict = None):
+    """Accept either a CampusGraph or the dict-of-dicts form."""
+    if isinstance(graph, CampusGraph):
+        return graph
+    return CampusGraph.from_dict(graph, pos)
+
+
+# Graph Algorithms
+
+def _compute_scale(g: CampusGraph):
+    if g.xs is None:
+        return 0.0
+    xs, ys = g.xs, g.ys
+    scale = float('inf')
+    for u, v, w in g.edges():
+        d = math.hypot(xs[u] - xs[v], ys[u] - ys[v])
+        if d > 0:
+            scale = min(scale, w / d)
+    return 0.0 if scale == float('inf') else scale
+
+def heuristic_scale(graph, pos: dict = None):
+    """
+    Largest factor k such that k * straight-line distance never exceeds an edge weight.
+    Map coordinates are in pixels and weights in campus units, so the raw
+    distance must be scaled down to keep the A* heuristic admissible (and consistent).
+    Returns 0.0 (plain Dijkstra) when some node has no position.
+    """
+    return as_campus_graph(graph, pos).heuristic_scale
+
+def _reconstruct(came_from: dict, start: int, goal: int):
+    path, cur = [], goal
+    while cur != start:
+        path.append(cur)
+        cur = came_from[cur]
+    path.append(start)
+    path.reverse()
+    return path
+
+def a_star(graph, start: str, goal: str, pos: dict = None, scale: float = None):
+    """
+    A* guided by scaled straight-line distance to goal (from pos, e.g. NODE_POS,
+    or the coordinates stored in a CampusGraph).
+    Without coordinates the heuristic is zero and the search is plain Dijkstra.
+    scale overrides the graph's cached heuristic_scale.
+    Returns (path_nodes_list or None, total_cost).
+    """
+    if start == goal:
+        return [start], 0
+    g = as_campus_graph(graph, pos)
+    s, t = g.index[start], g.index[goal]
+    if scale is None:
+        scale = g.heuristic_scale
+    if not scale:
+        h = lambda n: 0
+    else:
+        xs, ys = g.xs, g.ys
+        gx, gy = xs[t], ys[t]
+        h = lambda n: scale * math.hypot(xs[n] - gx, ys[n] - gy)
+
+    t0 = metrics.start()
+    pq = [(h(s), 0, s)]
+    came_from = {}
+    cost = {s: 0}
+    closed = set()
+    stale = 0
+    inf = float('inf')
+    result = None, inf
+    while pq:
+        _, d, u = heapq.heappop(pq)
+        if u in closed or d != cost[u]:
+            stale += 1
+            continue  # stale entry
+        if u == t:
+            result = [g.names[i] for i in _reconstruct(came_from, s, t)], d
+            break
+        closed.add(u)
+        for v, w in g.adjacency(u):
+            if v in closed:
+                continue
+            nd = d + w
+            if nd < cost.get(v, inf):
+                cost[v] = nd
+                came_from[v] = u
+                heapq.heappush(pq, (nd + h(v), nd, v))
+    if metrics.ENABLED:
+        # pushes = every entry popped (settled or stale) + what is left on the heap
+        settled = len(closed) + (result[0] is not None)
+        offsets = g.offsets
+        metrics.search("a_star", t0, settled, stale, settled + stale + len(pq),
+                       sum(offsets[u + 1] - offsets[u] for u in closed))
+    return result
+
+def bidirectional_a_star(graph, start: str, goal: str, pos: dict = None, scale: float = None):
+    """
+    Bidirectional A* on an undirected graph, using the averaged potential
+    p(v) = (h_goal(v) - h_start(v)) / 2 so both searches stay consistent.
+    Stops once the two frontiers can no longer improve the best meeting point.
+    Returns (path_nodes_list or None, total_cost), same as a_star().
+    """
+    if start == goal:
+        return [start], 0
+    g = as_campus_graph(graph, pos)
+    s, t = g.index[start], g.index[goal]
+    if scale is None:
+        scale = g.heuristic_scale
+    if not scale:
+        p = lambda n: 0
+    else:
+        xs, ys = g.xs, g.ys
+        sx, sy, gx, gy = xs[s], ys[s], xs[t], ys[t]
+        p = lambda n: scale * (math.hypot(xs[n] - gx, ys[n] - gy)
+                               - math.hypot(xs[n] - sx, ys[n] - sy)) / 2
+
+    # index 0 = forward (from start), 1 = backward (from goal); backward key uses -p
+    t0 = metrics.start()
+    stale = 0
+    sign = (1, -1)
+    pqs = ([(p(s), 0, s)], [(-p(t), 0, t)])
+    costs = ({s: 0}, {t: 0})
+    parents = ({}, {})
+    closed = (set(), set())
+    inf = float('inf')
+    best, meet = inf, None
+    while pqs[0] and pqs[1]:
+        if pqs[0][0][0] + pqs[1][0][0] >= best:
+            break
+        side = 0 if pqs[0][0][0] <= pqs[1][0][0] else 1
+        _, d, u = heapq.heappop(pqs[side])
+        cost, other = costs[side], costs[1 - side]
+        if u in closed[side] or d != cost[u]:
+            stale += 1
+            continue  # stale entry
+        closed[side].add(u)
+        for v, w in g.adjacency(u):
+            if v in closed[side]:
+                continue
+            nd = d + w
+            if nd < cost.get(v, inf):
+                cost[v] = nd
+                parents[side][v] = u
+                heapq.heappush(pqs[side], (nd + sign[side] * p(v), nd, v))
+            if v in other and nd + other[v] < best:
+                best, meet = nd + other[v], v
+    if metrics.ENABLED:
+        settled = len(closed[0]) + len(closed[1])
+        offsets = g.offsets
+        metrics.search("bidirectional_a_star", t0, settled, stale, settled + stale + len(pqs[0]) + len(pqs[1]),
+                       sum(offsets[u + 1] - offsets[u] for side in closed for u in side))
+    if meet is None:
+        return None, float('inf')
+    path = _reconstruct(parents[0], s, meet)
+    cur = meet
+    while cur != t:
+        cur = parents[1][cur]
+        path.append(cur)
+    return [g.names[i] for i in path], best
+
+def _spur_search(g: CampusGraph, s: int, t: int, h, banned, blocked, limit: float):
+    """
+    A* s -> t avoiding the banned nodes and the edges s -> v for v in blocked,
+    with h = exact distances to t in the unrestricted graph (still a consistent
+    lower bound once nodes and edges are removed). Gives up past limit.
+    Returns (path ids, cost) or None.
+    """
+    inf = float('inf')
+    offsets, neighbors, weights = g.offsets, g.neighbors, g.weights
+    cost = {s: 0}
+    came_from = {}
+    pq = [(h[s], 0, s)]
+    while pq:
+        f, d, u = heapq.heappop(pq)
+        if f > limit:
+            return None
+        if d != cost[u]:
+            continue  # stale entry
+        if u == t:
+            return _reconstruct(came_from, s, t), d
+        for k in range(offsets[u], offsets[u + 1]):
+            v = neighbors[k]
+            if v in banned or (u == s and v in blocked) or h[v] == inf:
+                continue
+            nd = d + weights[k]
+            if nd < cost.get(v, inf):
+                cost[v] = nd
+                came_from[v] = u
+                heapq.heappush(pq, (nd + h[v], nd, v))
+    return None
+
+def k_shortest_ids(g: CampusGraph, s: int, t: int, k: int, to_goal=None):
+    """
+    Yen's k shortest loopless paths over node ids: [(path ids, cost)], cheapest first.
+    to_goal is a (dist, parent) shortest-path tree rooted at t (dijkstra_ids, or
+    a cached one); it is computed if not given. Its distances are an exact A*
+    heuristic for every spur search, and where the tree's own path from the spur
+    node avoids everything the spur must avoid, it is used with no search at all.
+    """
+    inf = float('inf')
+    h, toward = to_goal if to_goal is not None else dijkstra_ids(g, t)
+    if k <= 0 or h[s] == inf:
+        return []
+    t0 = metrics.start()
+    searches = 0
+
+    def tree_path(u, banned, blocked):
+        """u -> t along the tree, or None if it touches banned / starts with a blocked edge."""
+        path = [u]
+        while path[-1] != t:
+            v = toward[path[-1]]
+            if v in banned or (len(path) == 1 and v in blocked):
+                return None
+            path.append(v)
+        return path
+
+    def weight(u, v):
+        return g.weights[g._slots(u, v)[0]]
+
+    found = [(tree_path(s, (), ()), h[s])]
+    candidates, seen = [], {tuple(found[0][0])}
+    while len(found) < k:
+        last = found[-1][0]
+        root_cost = 0
+        for i in range(len(last) - 1):
+            spur, root = last[i], last[:i + 1]
+            blocked = {p[i + 1] for p, _ in found if p[:i + 1] == root}
+            banned = set(root[:-1])
+            spur_path = tree_path(spur, banned, blocked)
+            if spur_path is not None:
+                spur_cost = h[spur]
+            else:
+                # only worth finding if it could still make the final k
+                need = k - len(found)
+                limit = heapq.nsmallest(need, candidates)[-1][0] - root_cost if len(candidates) >= need else inf
+                searches += 1
+                hit = _spur_search(g, spur, t, h, banned, blocked, limit)
+                spur_path, spur_cost = hit if hit is not None else (None, inf)
+            if spur_path is not None:
+                path = root[:-1] + spur_path
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heapq.heappush(candidates, (root_cost + spur_cost, path))
+            root_cost += weight(last[i], last[i + 1])
+        if not candidates:
+            break
+        cost, path = heapq.heappop(candidates)
+        found.append((path, cost))
+    if metrics.ENABLED:
+        metrics.elapsed("k_shortest", t0)
+        metrics.observe("k_shortest.spur_searches", searches)
+    return found
+
+def k_shortest_paths(graph, start: str, goal: str, k: int = 3, to_goal=None):
+    """
+    Up to k loopless routes start -> goal, shortest first (Yen's algorithm),
+    e.g. a second-best route that avoids a crowded segment.
+    to_goal: optional (dist, parent) tree rooted at goal to reuse (see k_shortest_ids).
+    Returns [(path_nodes_list, total_cost)]; empty if goal is unreachable.
+    """
+    g = as_campus_graph(graph)
+    names = g.names
+    return [([names[u] for u in path], cost)
+            for path, cost in k_shortest_ids(g, g.index[start], g.index[goal], k, to_goal)]
+
+def dijkstra_ids(g: CampusGraph, source: int, targets=None):
+    """
+    Dijkstra over node ids. With targets (ids), stops once all of them are settled.
+    Returns (dist: list[float], parent: list[int]) with parent -1 for the root/unreached.
+    """
+    n = len(g)
+    dist = [float('inf')] * n
+    parent = [-1] * n
+    dist[source] = 0
+    remaining = set(targets) if targets is not None else None
+    offsets, neighbors, weights = g.offsets, g.neighbors, g.weights
+    t0 = metrics.start()
+    stale = 0
+    pq = [(0, source)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d != dist[u]:
+            stale += 1
+            continue
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
+        for k in range(offsets[u], offsets[u + 1]):
+            v = neighbors[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                heapq.heappush(pq, (nd, v))
+    if metrics.ENABLED:
+        # settled = reached minus the frontier still waiting on the heap (entries
+        # are only pushed on strict improvement, so d == dist[v] means not popped)
+        frontier = {v for d, v in pq if d == dist[v]}
+        settled = [v for v in range(n) if dist[v] != float('inf') and v not in frontier]
+        metrics.search("dijkstra", t0, len(settled), stale, len(settled) + stale + len(pq),
+                       sum(offsets[v + 1] - offsets[v] for v in settled))
+    return dist, parent
+
+def first_hops(dist, parent, source: int):
+    """
+    From one shortest-path tree (dijkstra_ids), the first node after source on
+    the path to every node: list[int], -1 for source itself and unreached nodes.
+    """
+    first = [-1] * len(dist)
+    # walk up the parent chain to the first node with a known hop (or a child of
+    # source), then hand that hop down the chain; sorting by dist is not enough
+    # because zero-weight paths let a child tie with its parent
+    for t in range(len(dist)):
+        if first[t] != -1 or parent[t] == -1:
+            continue
+        chain, v = [], t
+        while first[v] == -1:
+            chain.append(v)
+            if parent[v] == source:
+                first[v] = v
+                break
+            v = parent[v]
+        hop = first[v]
+        for u in chain:
+            first[u] = hop
+    return first
+
+def multi_source_ids(g: CampusGraph, sources):
+    """
+    One Dijkstra sweep seeded with every source at distance 0.
+    Returns (dist, parent, origin) lists; origin[v] is the id of the nearest source (-1 if unreachable).
+    """
+    n = len(g)
+    dist = [float('inf')] * n
+    parent = [-1] * n
+    origin = [-1] * n
+    pq = []
+    for s in sources:
+        dist[s] = 0
+        origin[s] = s
+        pq.append((0, s))
+    heapq.heapify(pq)
+    offsets, neighbors, weights = g.offsets, g.neighbors, g.weights
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d != dist[u]:
+            continue
+        for k in range(offsets[u], offsets[u + 1]):
+            v = neighbors[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                origin[v] = origin[u]
+                heapq.heappush(pq, (nd, v))
+    return dist, parent, origin
+
+def dijkstra_spt(graph, start: str):
+    """
+    Dijkstra shortest-path tree from start.
+    Returns (dist: dict[node->cost], parent: dict[node->parent]).
+    """
+    g = as_campus_graph(graph)
+    dist, parent = dijkstra_ids(g, g.index[start])
+    names = g.names
+    return (dict(zip(names, dist)),
+            {names[v]: (names[p] if p >= 0 else None) for v, p in enumerate(parent)})
+
+def multi_source_dijkstra(graph, sources):
+    """
+    Nearest-of-many in one pass, e.g. the closest gate to every building.
+    Returns (dist: dict[node->cost to nearest source], nearest: dict[node->source or None]).
+    """
+    g = as_campus_graph(graph)
+    dist, _, origin = multi_source_ids(g, [g.index[s] for s in sources])
+    names = g.names
+    return (dict(zip(names, dist)),
+            {names[v]: (names[o] if o >= 0 else None) for v, o in enumerate(origin)})
+
+def distance_matrix(graph, sources, targets):
+    """
+    Shortest distances from every source to every target (inf if unreachable).
+    Runs one early-exit search per row instead of one search per pair, and on
+    a symmetric (undirected) graph searches from whichever side is smaller.
+    Returns a NumPy array shaped (len(sources), len(targets)); requires numpy.
+    """
+    np = numpy_required("distance_matrix()")
+    g = as_campus_graph(graph)
+    src = [g.index[s] for s in sources]
+    dst = [g.index[t] for t in targets]
+    flip = len(dst) < len(src) and g.symmetric
+    rows, cols = (dst, src) if flip else (src, dst)
+    out = array('d', bytes(8 * len(src) * len(dst)))
+    for i, r in enumerate(rows):
+        dist, _ = dijkstra_ids(g, r, cols)
+        for j, c in enumerate(cols):
+            if flip:
+                out[j * len(dst) + i] = dist[c]
+            else:
+                out[i * len(dst) + j] = dist[c]
+    return np.frombuffer(out, dtype=np.float64).reshape(len(src), len(dst))
+
+class DisjointSet:
+    """
+    Union-find over integer ids 0..n-1 stored in flat arrays.
+    find() is iterative with full path compression (no recursion limit on
+    big maps); union() is by rank.
+    """
+    def __init__(self, n: int):
+        self.parent = array('i', range(n))
+        self.rank = array('b', bytes(n))
+
+    def find(self, x: int):
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a: int, b: int):
+        """Merge the sets of a and b; False if they were already one set."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        rank = self.rank
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        if rank[ra] == rank[rb]:
+            rank[ra] += 1
+        return True
+
+def kruskal_mst(graph):
+    """
+    Kruskal MST for an undirected weighted graph (dict of dict or CampusGraph).
+    Returns (mst_edges: list[(u,v,w)], total_weight).
+    """
+    g = as_campus_graph(graph)
+    names = g.names
+    mst, total = [], 0
+    for u, v, w in kruskal_ids(g):
+        mst.append((names[u], names[v], w))
+        total += w
+    return mst, total
+
+def kruskal_ids(g: CampusGraph):
+    """Minimum spanning forest edges as (u_id, v_id, w), lightest first."""
+    sets = DisjointSet(len(g))
+    return [(u, v, w) for u, v, w in sorted(g.edges(), key=lambda e: e[2]) if sets.union(u, v)]
@@ -0,0 +1,213 @@
+import argparse
+from array import array
+from collections.abc import Mapping, Sequence
+import csv
+import json
+import mmap
+import os
+import struct
+
+from campus_graph import CampusGraph
+
+
+# Campus Map Files
+#
+#   .json   {"graph": {name: {name: weight}}, "pos": {name: [x, y]}}  (CAMPUS_GRAPH / NODE_POS shape)
+#   .csv    edges: source,target,weight   (+ optional nodes file: name,x,y)
+#   .cmap   compact binary form, memory-mapped by load_map()
+#
+# .cmap layout (native byte order; every section starts on an 8-byte boundary):
+#   magic b"CNMP" | version u32 | n u64 | m u64 (directed entries) | names bytes u64 | flags u32 | padding to 64
+#   offsets      int64[n + 1]     CSR, as in CampusGraph
+#   weights      float64[m]
+#   xs, ys       float64[n] each  (only if flags & HAS_COORDS)
+#   name_offsets int64[n + 1]     node i's UTF-8 name is names[name_offsets[i]:name_offsets[i + 1]]
+#   neighbors    int32[m]
+#   name_order   int32[n]         ids sorted by UTF-8 name, for lookups without a dict
+#   names        bytes
+
+MAGIC = b"CNMP"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("=4sIQQQI")
+HEADER_SIZE = 64
+HAS_COORDS = 1
+
+
+class MapNames(Sequence):
+    """Node names decoded from the mapped file on access (nothing is decoded up front)."""
+    def __init__(self, blob, name_offsets):
+        self._blob = blob
+        self._offsets = name_offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def raw(self, i: int):
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("node id out of range")
+        return self.raw(i).decode("utf-8")
+
+
+class NameIndex(Mapping):
+    """name -> id by binary search over the file's sorted name order."""
+    def __init__(self, names: MapNames, order):
+        self._names = names
+        self._order = order
+
+    def __getitem__(self, name):
+        if not isinstance(name, str):
+            raise KeyError(name)
+        key = name.encode("utf-8")
+        order, names = self._order, self._names
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if names.raw(order[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(order) and names.raw(order[lo]) == key:
+            return order[lo]
+        raise KeyError(name)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        return iter(self._names)
+
+
+def _pad(f):
+    f.write(b"\0" * (-f.tell() % 8))
+
+
+def save_map(graph: CampusGraph, path: str):
+    """Write graph as a .cmap file, atomically (temp file + rename)."""
+    g = graph
+    n, m = len(g), g.num_edges
+    encoded = [str(name).encode("utf-8") for name in g.names]
+    name_offsets = array('q', [0])
+    for b in encoded:
+        name_offsets.append(name_offsets[-1] + len(b))
+    order = array('i', sorted(range(n), key=encoded.__getitem__))
+    flags = HAS_COORDS if g.xs is not None else 0
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, n, m, name_offsets[-1], flags).ljust(HEADER_SIZE, b"\0"))
+        sections = [g.offsets, g.weights] + ([g.xs, g.ys] if flags & HAS_COORDS else [])
+        for buf in sections + [name_offsets, g.neighbors, order]:
+            f.write(bytes(buf))
+            _pad(f)
+        f.write(b"".join(encoded))
+    os.replace(tmp, path)
+
+
+def load_map(path: str):
+    """
+    Memory-map a .cmap file as a CampusGraph. Only the header is read here;
+    adjacency, weights, coordinates and names are paged in as they are used.
+    The mapping is copy-on-write, so runtime edits (closures) never touch the file.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    if len(mm) < HEADER_SIZE:
+        raise ValueError(f"{path}: not a campus map file")
+    magic, version, n, m, names_size, flags = _HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path}: not a campus map file (or an unsupported version)")
+    view, pos = memoryview(mm), HEADER_SIZE
+
+    def section(typecode, count, size):
+        nonlocal pos
+        start, pos = pos, pos + count * size
+        pos += -pos % 8
+        return view[start:start + count * size].cast(typecode)
+
+    offsets = section('q', n + 1, 8)
+    weights = section('d', m, 8)
+    xs = ys = None
+    if flags & HAS_COORDS:
+        xs, ys = section('d', n, 8), section('d', n, 8)
+    name_offsets = section('q', n + 1, 8)
+    neighbors = section('i', m, 4)
+    order = section('i', n, 4)
+    if pos + names_size != len(mm):
+        raise ValueError(f"{path}: truncated or corrupt campus map file")
+    names = MapNames(view[pos:pos + names_size], name_offsets)
+    return CampusGraph(names, offsets, neighbors, weights, xs, ys, index=NameIndex(names, order))
+
+
+def import_json(path: str):
+    """CampusGraph from {"graph": {...}, "pos": {...}} (pos optional)."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return CampusGraph.from_dict(data["graph"], data.get("pos"))
+
+
+def import_csv(edges_path: str, nodes_path: str = None):
+    """
+    CampusGraph from an undirected edge list (source,target,weight header row)
+    and optionally a node file (name,x,y) for positions.
+    """
+    names, index, us, vs, ws = [], {}, [], [], []
+
+    def node(name):
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+        return index[name]
+
+    pos = {}
+    if nodes_path:
+        with open(nodes_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                node(row["name"])
+                pos[row["name"]] = (float(row["x"]), float(row["y"]))
+    with open(edges_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            us.append(node(row["source"]))
+            vs.append(node(row["target"]))
+            ws.append(float(row["weight"]))
+    xs = ys = None
+    if nodes_path:
+        missing = [name for name in names if name not in pos]
+        if missing:
+            raise ValueError(f"{nodes_path}: no position for {', '.join(missing[:5])}"
+                             + (f" and {len(missing) - 5} more" if len(missing) > 5 else ""))
+        xs = [pos[name][0] for name in names]
+        ys = [pos[name][1] for name in names]
+    return CampusGraph.from_edges(names, us, vs, ws, xs, ys)
+
+
+def open_map(path: str, nodes_path: str = None):
+    """Load any supported map file, picked by extension (.json, .csv, else .cmap)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        return import_json(path)
+    if ext == ".csv":
+        return import_csv(path, nodes_path)
+    return load_map(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a campus map (JSON / CSV) to the binary .cmap form.")
+    parser.add_argument("source", help="map.json, or edges.csv (source,target,weight)")
+    parser.add_argument("target", help="output .cmap file")
+    parser.add_argument("--nodes", help="nodes.csv (name,x,y) to go with an edges CSV")
+    args = parser.parse_args(argv)
+
+    g = open_map(args.source, args.nodes)
+    save_map(g, args.target)
+    print(f"{args.target}: {len(g)} locations, {g.num_edges // 2} paths")
+
+
+if __name__ == "__main__":
+    main()
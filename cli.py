@@ -0,0 +1,97 @@
+import argparse
+import json
+import sys
+import time
+
+import metrics
+from queries import (QueryError, mst_query, nearest_query, node_param, number_param, reachable_query,
+                     route_query, set_graph)
+
+
+# JSONL Batch Queries
+#
+#   python cli.py < queries.jsonl > answers.jsonl
+#
+# One JSON object per input line, one answer per output line, in order and
+# written as soon as it is computed (so the command also works as a long-lived
+# co-process on a pipe). The graph is loaded once for the whole stream.
+#
+#   {"op": "route", "from": "Library", "to": "Lab"}        -> {"path": [...], "cost": 7}
+#   {"op": "reachable", "from": "Library", "budget": 8}    -> {"reachable": [...], "edges": [...]}
+#   {"op": "mst"}                                          -> {"edges": [[u, v, w]], "total": 34}
+#   {"op": "nearest", "x": 410, "y": 180}                  -> {"node": "Lab", "distance": 10.0}
+#
+# An "id" field is copied to the answer. A bad line gets {"error": "..."} and
+# the stream carries on. Only the graph modules are imported: no tkinter, no
+# MySQL driver, no display needed.
+
+
+def answer(graph, query):
+    """The answer object for one parsed query line."""
+    if not isinstance(query, dict):
+        raise QueryError("query must be a JSON object")
+    op = query.get("op")
+    if op == "route":
+        return route_query(node_param(graph, query, "from"), node_param(graph, query, "to"))
+    if op == "reachable":
+        return reachable_query(node_param(graph, query, "from"), number_param(query, "budget", minimum=0))
+    if op == "mst":
+        return mst_query()
+    if op == "nearest":
+        if graph.xs is None:
+            raise QueryError("this map has no coordinates")
+        return nearest_query(number_param(query, "x"), number_param(query, "y"))
+    raise QueryError(f"unknown op {op!r} (route, reachable, mst, nearest)")
+
+
+def run(graph, lines, out):
+    """Answer every non-blank line of lines, writing one JSON line each to out. Returns the count."""
+    set_graph(graph)
+    count = 0
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        count += 1
+        query = None
+        try:
+            query = json.loads(line)
+            t0 = metrics.start()
+            result = answer(graph, query)
+            metrics.elapsed(f"cli.{query['op']}", t0)
+        except QueryError as e:
+            result = {"error": str(e)}
+        except ValueError as e:  # JSONDecodeError included
+            result = {"error": f"line {number}: {e}"}
+        except Exception as e:  # one bad line must not end the stream
+            result = {"error": f"line {number}: {type(e).__name__}: {e}"}
+        if isinstance(query, dict) and "id" in query:
+            result = {"id": query["id"], **result}
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer route / reachable / mst / nearest queries "
+                                                 "read as JSON lines from stdin.")
+    parser.add_argument("--map", help="map file (.cmap, .json or edges .csv); default: CAMPUS_MAP or the built-in campus")
+    parser.add_argument("--nodes", help="nodes.csv (name,x,y) to go with an edges CSV")
+    parser.add_argument("--metrics", action="store_true", help="print query timings to stderr at the end")
+    args = parser.parse_args(argv)
+    metrics.enable(args.metrics)
+
+    t0 = time.perf_counter()
+    if args.map:
+        from campus_map import open_map
+        graph = open_map(args.map, args.nodes)
+    else:
+        from campus_data import CAMPUS as graph
+    loaded = time.perf_counter() - t0
+    count = run(graph, sys.stdin, sys.stdout)
+    if args.metrics:
+        print(f"{count} queries on {len(graph)} locations (map loaded in {loaded * 1000:.1f} ms)\n"
+              + metrics.REGISTRY.format(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
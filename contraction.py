@@ -0,0 +1,277 @@
+from array import array
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+
+from campus_graph import CampusGraph, as_campus_graph
+
+
+# Contraction Hierarchies
+#
+# File layout (native byte order, 64-byte header, 8-byte arrays first for alignment):
+#   magic b"CNCH" | version u32 | n u64 | m u64 | sha256 digest (32 bytes) | padding
+#   offsets int64[n + 1] | weights float64[m] | rank int32[n] | targets int32[m] | middle int32[m]
+# Edge k of node u (offsets[u] <= k < offsets[u+1]) goes to a higher-ranked node;
+# middle[k] is the contracted node a shortcut bypasses (-1 for an original edge).
+
+MAGIC = b"CNCH"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("=4sIQQ32s")
+HEADER_SIZE = 64
+
+# Witness searches give up after this many settled nodes (extra shortcuts stay correct)
+WITNESS_SETTLE_LIMIT = 200
+
+
+def _witness_dist(adj, contracted, source, skip, target_set, limit):
+    """Bounded Dijkstra from source avoiding skip; distances to the nodes in target_set."""
+    dist = {source: 0}
+    found = {}
+    pq = [(0, source)]
+    settled = 0
+    while pq and settled < WITNESS_SETTLE_LIMIT:
+        d, u = heapq.heappop(pq)
+        if d != dist[u]:
+            continue
+        if d > limit:
+            break
+        settled += 1
+        if u in target_set:
+            found[u] = d
+            if len(found) == len(target_set):
+                break
+        for v, (w, _) in adj[u].items():
+            if v == skip or contracted[v]:
+                continue
+            nd = d + w
+            if v not in dist or nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(pq, (nd, v))
+    return found
+
+
+def _shortcuts(adj, contracted, v):
+    """Shortcuts (u, x, weight) needed if v were contracted now (each pair once, u < x)."""
+    nbrs = [(u, w) for u, (w, _) in adj[v].items() if not contracted[u]]
+    out = []
+    if len(nbrs) < 2:
+        return out, nbrs
+    max_out = max(w for _, w in nbrs)
+    for i, (u, wu) in enumerate(nbrs):
+        targets = {x for x, _ in nbrs[i + 1:]}
+        if not targets:
+            break
+        found = _witness_dist(adj, contracted, u, v, targets, wu + max_out)
+        for x, wx in nbrs[i + 1:]:
+            via = wu + wx
+            if found.get(x, float('inf')) > via:
+                out.append((u, x, via))
+    return out, nbrs
+
+
+class ContractionHierarchy:
+    """
+    Contraction-hierarchies engine for large maps.
+    Usage:
+        ch = ContractionHierarchy.load_or_build(CAMPUS, "cache/campus.ch")
+        path, cost = ch.query("Front Gate", "Back Gate")   # same shape as a_star()
+    Preprocessing contracts nodes in edge-difference order (lazy updates),
+    inserting shortcuts only where a bounded witness search finds no detour.
+    Queries run a bidirectional Dijkstra that only follows edges upward in rank.
+    """
+    def __init__(self, g: CampusGraph, rank, offsets, targets, weights, middle, digest: str, mm=None):
+        self.graph = g
+        self.rank = rank
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.middle = middle
+        self.digest = digest
+        self._mm = mm
+
+    @classmethod
+    def build(cls, graph):
+        """Order nodes, contract them one by one and keep the upward edges + shortcuts."""
+        g = as_campus_graph(graph)
+        digest = g.digest()  # of the weights the build starts from (pass a snapshot() if edits can race)
+        n = len(g)
+        # overlay graph of the remaining nodes: adj[u][v] = (weight, middle)
+        adj = [dict() for _ in range(n)]
+        for u, v, w in g.edges():
+            if v not in adj[u] or w < adj[u][v][0]:
+                adj[u][v] = adj[v][u] = (w, -1)
+        contracted = [False] * n
+        deleted_nbrs = [0] * n
+        rank = array('i', [0] * n)
+
+        def priority(sc, nbrs, v):
+            # edge difference + number of already contracted neighbours
+            return len(sc) - len(nbrs) + deleted_nbrs[v]
+
+        pq = [(priority(*_shortcuts(adj, contracted, v), v), v) for v in range(n)]
+        heapq.heapify(pq)
+        up = [None] * n
+        order = 0
+        while pq:
+            _, v = heapq.heappop(pq)
+            if contracted[v]:
+                continue
+            # lazy update: re-evaluate, and defer if v is no longer the best choice
+            sc, nbrs = _shortcuts(adj, contracted, v)
+            p = priority(sc, nbrs, v)
+            if pq and p > pq[0][0]:
+                heapq.heappush(pq, (p, v))
+                continue
+            up[v] = [(u, adj[v][u][0], adj[v][u][1]) for u, _ in nbrs]
+            contracted[v] = True
+            rank[v] = order
+            order += 1
+            for u, _ in nbrs:
+                deleted_nbrs[u] += 1
+            for u, x, w in sc:
+                if x not in adj[u] or w < adj[u][x][0]:
+                    adj[u][x] = adj[x][u] = (w, v)
+
+        offsets, targets, weights, middle = array('q', [0]), array('i'), array('d'), array('i')
+        for v in range(n):
+            for u, w, mid in up[v]:
+                targets.append(u)
+                weights.append(w)
+                middle.append(mid)
+            offsets.append(len(targets))
+        return cls(g, rank, offsets, targets, weights, middle, digest)
+
+    @classmethod
+    def load(cls, graph, path: str):
+        """Memory-map a hierarchy file; returns None if it is missing, stale or corrupt."""
+        g = as_campus_graph(graph)
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return None
+        with f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                return None
+        if len(mm) < HEADER_SIZE:
+            mm.close()
+            return None
+        magic, version, n, m, digest = _HEADER.unpack_from(mm, 0)
+        sizes = ((n + 1) * 8, m * 8, n * 4, m * 4, m * 4)
+        if (magic != MAGIC or version != FORMAT_VERSION or n != len(g)
+                or digest.hex() != g.digest() or len(mm) != HEADER_SIZE + sum(sizes)):
+            mm.close()
+            return None
+        view, pos, parts = memoryview(mm), HEADER_SIZE, []
+        for size, code in zip(sizes, "qdiii"):
+            parts.append(view[pos:pos + size].cast(code))
+            pos += size
+        offsets, weights, rank, targets, middle = parts
+        return cls(g, rank, offsets, targets, weights, middle, digest.hex(), mm)
+
+    def save(self, path: str):
+        """Write atomically (temp file + rename)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(self.rank), len(self.targets),
+                              bytes.fromhex(self.digest))
+        # unique temp name: two background rebuilds may save at the same time
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path) or ".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header.ljust(HEADER_SIZE, b"\0"))
+                for buf in (self.offsets, self.weights, self.rank, self.targets, self.middle):
+                    f.write(bytes(buf))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load_or_build(cls, graph, path: str):
+        """Use the persisted hierarchy when its graph digest matches, else rebuild it."""
+        g = as_campus_graph(graph)
+        ch = cls.load(g, path)
+        if ch is None:
+            ch = cls.build(g)
+            ch.save(path)
+            ch = cls.load(g, path) or ch
+        return ch
+
+    def close(self):
+        if self._mm is not None:
+            for buf in (self.offsets, self.weights, self.rank, self.targets, self.middle):
+                buf.release()
+            self._mm.close()
+            self._mm = None
+
+    def _upward(self, u: int):
+        a, b = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[a:b], self.weights[a:b])
+
+    def _middle(self, a: int, b: int):
+        """Middle node of hierarchy edge a-b (stored at the lower-ranked endpoint)."""
+        lo, hi = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        best, mid = float('inf'), -1
+        for k in range(self.offsets[lo], self.offsets[lo + 1]):
+            if self.targets[k] == hi and self.weights[k] < best:
+                best, mid = self.weights[k], self.middle[k]
+        return mid
+
+    def _unpack(self, path):
+        """Expand shortcuts until every consecutive pair is an original edge."""
+        out = [path[0]]
+        stack = [(path[i], path[i + 1]) for i in range(len(path) - 2, -1, -1)]
+        while stack:
+            a, b = stack.pop()
+            m = self._middle(a, b)
+            if m == -1:
+                out.append(b)
+            else:
+                stack.append((m, b))
+                stack.append((a, m))
+        return out
+
+    def query(self, start: str, goal: str):
+        """
+        Bidirectional upward search.
+        Returns (path_nodes_list or None, total_cost), same as a_star().
+        """
+        if start == goal:
+            return [start], 0
+        g = self.graph
+        s, t = g.index[start], g.index[goal]
+        dists = ({s: 0}, {t: 0})
+        parents = ({}, {})
+        pqs = ([(0, s)], [(0, t)])
+        best, meet = float('inf'), -1
+        while pqs[0] or pqs[1]:
+            side = 0 if pqs[0] and (not pqs[1] or pqs[0][0][0] <= pqs[1][0][0]) else 1
+            d, u = heapq.heappop(pqs[side])
+            if d >= best:
+                pqs[side].clear()  # nothing left on this side can improve the answer
+                continue
+            dist, other = dists[side], dists[1 - side]
+            if d != dist[u]:
+                continue
+            if u in other and d + other[u] < best:
+                best, meet = d + other[u], u
+            for v, w in self._upward(u):
+                nd = d + w
+                if v not in dist or nd < dist[v]:
+                    dist[v] = nd
+                    parents[side][v] = u
+                    heapq.heappush(pqs[side], (nd, v))
+        if meet == -1:
+            return None, float('inf')
+        up = [meet]
+        while up[-1] != s:
+            up.append(parents[0][up[-1]])
+        up.reverse()
+        cur = meet
+        while cur != t:
+            cur = parents[1][cur]
+            up.append(cur)
+        return [g.names[i] for i in self._unpack(up)], best
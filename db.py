@@ -0,0 +1,689 @@
+from contextlib import contextmanager
+from datetime import datetime
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+
+import metrics
+
+
+# Database
+
+DB_CONFIG = dict(
+    host="localhost",
+    user="root",
+    password="",  # <--- set if needed
+    database="campus_navigator",
+)
+
+POOL_SIZE = 4
+POOL_TIMEOUT = 10  # seconds to wait for a free connection
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        username VARCHAR(50) UNIQUE,
+        password VARCHAR(50)
+    )
+    """,
+    # Saved routes, normalized: each location name is stored once (route_nodes),
+    # each distinct path once (routes, keyed by a hash of its node ids), and a
+    # user's saved route is a reference to it (user_routes).
+    """
+    CREATE TABLE IF NOT EXISTS route_nodes (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL UNIQUE,
+        uses INT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS routes (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        path_hash BINARY(16) NOT NULL UNIQUE,
+        nodes TEXT NOT NULL,
+        source_id INT NOT NULL,
+        destination_id INT NOT NULL,
+        hops INT NOT NULL,
+        save_count INT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_routes (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        username VARCHAR(50) NOT NULL,
+        route_id INT NOT NULL,
+        saved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+)
+
+# (table, index name, DDL) - created once if missing (MySQL has no CREATE INDEX IF NOT EXISTS)
+INDEXES = (
+    ("user_routes", "idx_user_routes_user_time",
+     "CREATE INDEX idx_user_routes_user_time ON user_routes (username, saved_at, id)"),
+    ("routes", "idx_routes_popularity", "CREATE INDEX idx_routes_popularity ON routes (save_count)"),
+    ("route_nodes", "idx_route_nodes_uses", "CREATE INDEX idx_route_nodes_uses ON route_nodes (uses)"),
+)
+
+# (function name, DDL) - created once if missing. decode_route() turns routes.nodes
+# back into "A -> B -> C"; as a function (not a subquery) it keeps the views below
+# mergeable, so paging through them still seeks on the user_routes index.
+ROUTINES = (
+    ("decode_route", """
+        CREATE FUNCTION decode_route(nodes TEXT) RETURNS TEXT
+        READS SQL DATA
+        RETURN (SELECT GROUP_CONCAT(n.name ORDER BY j.pos SEPARATOR ' -> ')
+                FROM JSON_TABLE(CONCAT('[', nodes, ']'), '$[*]'
+                                COLUMNS (pos FOR ORDINALITY, node_id INT PATH '$')) AS j
+                JOIN route_nodes n ON n.id = j.node_id)
+    """),
+)
+
+VIEWS = (
+    """
+    CREATE OR REPLACE VIEW route_texts AS
+    SELECT r.id, src.name AS source, dst.name AS destination, decode_route(r.nodes) AS route_text,
+           r.hops, r.save_count
+    FROM routes r
+    JOIN route_nodes src ON src.id = r.source_id
+    JOIN route_nodes dst ON dst.id = r.destination_id
+    """,
+    """
+    CREATE OR REPLACE VIEW saved_route_texts AS
+    SELECT ur.id, ur.username, src.name AS source, dst.name AS destination,
+           decode_route(r.nodes) AS route_text, ur.saved_at
+    FROM user_routes ur
+    JOIN routes r ON r.id = ur.route_id
+    JOIN route_nodes src ON src.id = r.source_id
+    JOIN route_nodes dst ON dst.id = r.destination_id
+    """,
+)
+
+# Run on every new connection (decode_route output is capped by group_concat_max_len)
+SESSION_SETUP = ("SET SESSION group_concat_max_len = 1048576",)
+
+ROUTE_SEP = " -> "
+MIGRATE_CHUNK = 1000  # legacy saved_routes rows converted per query
+IN_CHUNK = 500        # values per "IN (...)" lookup
+
+SAVED_ROUTES_PAGE = 50
+
+# Write-behind for saved routes: flush when this many rows wait, or after this many seconds
+WRITE_BATCH = 50
+WRITE_INTERVAL = 2.0
+RETRY_BASE = 1.0   # first retry delay after a failed flush (doubles up to RETRY_MAX)
+RETRY_MAX = 60.0
+
+
+def driver():
+    """mysql.connector, imported on first use so graph-only tools start without it."""
+    import mysql.connector
+    return mysql.connector
+
+
+def encode_route(node_ids):
+    """Compact node sequence stored in routes.nodes (and hashed for routes.path_hash): "3,17,42"."""
+    return ",".join(map(str, node_ids))
+
+
+def _route_names(route):
+    """Location names of a saved route: a list, or "A -> B -> C" text (legacy rows)."""
+    return route.split(ROUTE_SEP) if isinstance(route, str) else list(route)
+
+
+def connect_db():
+    """Create and return a standalone MySQL connection (the app uses the pool in DB)."""
+    return driver().connect(**DB_CONFIG)
+
+
+class _Pooled:
+    """A live connection plus the prepared cursors already created on it."""
+    def __init__(self, conn):
+        self.conn = conn
+        self.statements = {}
+
+    def cursor(self, sql: str):
+        cur = self.statements.get(sql)
+        if cur is None:
+            cur = self.statements[sql] = self.conn.cursor(prepared=True)
+        return cur
+
+
+class Session:
+    """Statement runner bound to one pooled connection; see Database.session()."""
+    def __init__(self, pooled: _Pooled):
+        self._pooled = pooled
+
+    def query(self, sql: str, params=()):
+        t0 = metrics.start()
+        cur = self._pooled.cursor(sql)
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+        metrics.elapsed("db.query", t0)
+        return rows
+
+    def executemany(self, sql: str, rows):
+        """Batch insert; a plain cursor lets the driver send one multi-row INSERT."""
+        t0 = metrics.start()
+        cur = self._pooled.conn.cursor()
+        try:
+            cur.executemany(sql, rows)
+            return cur.rowcount
+        finally:
+            cur.close()
+            metrics.elapsed("db.executemany", t0)
+
+    def query_in(self, sql: str, values):
+        """
+        Rows of sql with its "IN ({})" filled from values, IN_CHUNK at a time.
+        A plain cursor: one prepared statement per list length would pile up.
+        """
+        t0 = metrics.start()
+        values = list(values)
+        rows = []
+        cur = self._pooled.conn.cursor()
+        try:
+            for i in range(0, len(values), IN_CHUNK):
+                chunk = values[i:i + IN_CHUNK]
+                cur.execute(sql.format(", ".join(["%s"] * len(chunk))), chunk)
+                rows.extend(cur.fetchall())
+            return rows
+        finally:
+            cur.close()
+            metrics.elapsed("db.query", t0)
+
+    def execute(self, sql: str, params=()):
+        t0 = metrics.start()
+        cur = self._pooled.cursor(sql)
+        cur.execute(sql, params)
+        metrics.elapsed("db.execute", t0)
+        return cur.rowcount
+
+    def commit(self):
+        t0 = metrics.start()
+        self._pooled.conn.commit()
+        metrics.elapsed("db.commit", t0)
+
+
+class Database:
+    """
+    Bounded MySQL connection pool with per-connection prepared statements.
+    Usage:
+        db = Database()
+        db.ensure_schema()                    # once, at startup
+        with db.session() as s:
+            rows = s.query("SELECT ...", (arg,))
+    Connections are opened lazily (at most pool_size) and reused, so a click
+    costs a checkout instead of a TCP handshake + auth exchange.
+    """
+    def __init__(self, pool_size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT, **config):
+        self.config = config or DB_CONFIG
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._idle = queue.LifoQueue()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        self._node_ids = {}   # location name -> route_nodes.id (committed rows only)
+
+    def _checkout(self):
+        t0 = metrics.start()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise driver().errors.PoolError("No free database connection")
+        metrics.elapsed("db.pool_wait", t0)
+        try:
+            pooled = self._idle.get_nowait()
+        except queue.Empty:
+            pooled = None
+        try:
+            if pooled is None:
+                t0 = metrics.start()
+                pooled = _Pooled(driver().connect(**self.config))
+                self._setup_session(pooled.conn)
+                metrics.elapsed("db.connect", t0)
+            elif not pooled.conn.is_connected():
+                t0 = metrics.start()
+                pooled.conn.reconnect()
+                pooled.statements.clear()  # prepared statements die with the old session
+                self._setup_session(pooled.conn)
+                metrics.elapsed("db.connect", t0)
+            return pooled
+        except Exception:
+            self._slots.release()
+            raise
+
+    @staticmethod
+    def _setup_session(conn):
+        cur = conn.cursor()
+        for sql in SESSION_SETUP:
+            cur.execute(sql)
+        cur.close()
+
+    def _checkin(self, pooled: _Pooled, broken: bool):
+        if broken:
+            try:
+                pooled.conn.close()
+            except Exception:
+                pass
+        else:
+            self._idle.put(pooled)
+        self._slots.release()
+
+    @contextmanager
+    def session(self):
+        """Check out a connection; the transaction is rolled back if the block fails."""
+        if not self._schema_ready:
+            self.ensure_schema()
+        pooled = self._checkout()
+        try:
+            yield Session(pooled)
+        except BaseException:
+            try:
+                pooled.conn.rollback()
+                broken = False
+            except Exception:
+                broken = True  # connection is gone; open a fresh one next time
+            self._checkin(pooled, broken)
+            raise
+        self._checkin(pooled, broken=False)
+
+    def ensure_schema(self):
+        """
+        Create the tables, indexes and views once per process (retried on the next
+        session if the DB was down), and move rows from an old-style saved_routes table.
+        """
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            pooled = self._checkout()
+            broken = True
+            try:
+                cur = pooled.conn.cursor()
+                for ddl in SCHEMA:
+                    cur.execute(ddl)
+                for table, name, ddl in INDEXES:
+                    cur.execute("""
+                        SELECT 1 FROM information_schema.statistics
+                        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+                        LIMIT 1
+                    """, (table, name))
+                    if not cur.fetchall():
+                        cur.execute(ddl)
+                for name, ddl in ROUTINES:
+                    cur.execute("""
+                        SELECT 1 FROM information_schema.routines
+                        WHERE routine_schema = DATABASE() AND routine_name = %s
+                        LIMIT 1
+                    """, (name,))
+                    if not cur.fetchall():
+                        cur.execute(ddl)
+                for ddl in VIEWS:
+                    cur.execute(ddl)
+                cur.execute("""
+                    SELECT 1 FROM information_schema.tables
+                    WHERE table_schema = DATABASE() AND table_name = 'saved_routes'
+                      AND table_type = 'BASE TABLE'
+                """)
+                legacy = bool(cur.fetchall())
+                cur.close()
+                new_ids = self._migrate_saved_routes(Session(pooled)) if legacy else {}
+                pooled.conn.commit()
+                self._node_ids.update(new_ids)
+                broken = False
+            finally:
+                self._checkin(pooled, broken)
+            self._schema_ready = True
+
+    def _migrate_saved_routes(self, s: Session):
+        """
+        Copy rows of the old saved_routes table (route_text per row) into the
+        normalized tables, then rename it to saved_routes_legacy.
+        """
+        new_ids, last_id = {}, 0
+        while True:
+            rows = s.query("""
+                SELECT id, username, source, destination, route_text, saved_at
+                FROM saved_routes WHERE id > %s ORDER BY id LIMIT %s
+            """, (last_id, MIGRATE_CHUNK))
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            new_ids.update(self._insert_routes(s, [r[1:] for r in rows if r[4]]))
+        s.execute("RENAME TABLE saved_routes TO saved_routes_legacy")  # commits the copy too
+        return new_ids
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().conn.close()
+            except queue.Empty:
+                return
+
+    # Data access
+
+    def check_login(self, username: str, password: str):
+        with self.session() as s:
+            return bool(s.query("SELECT id FROM users WHERE username=%s AND password=%s",
+                                (username, password)))
+
+    def create_user(self, username: str, password: str):
+        """Returns False if the username is already taken."""
+        try:
+            with self.session() as s:
+                s.execute("INSERT INTO users (username, password) VALUES (%s, %s)",
+                          (username, password))
+                s.commit()
+            return True
+        except driver().IntegrityError:
+            return False
+
+    def save_route(self, username: str, source: str, destination: str, route):
+        """route is the list of location names (or "A -> B -> C" text)."""
+        self.save_routes([(username, source, destination, route,
+                           datetime.now().strftime("%Y-%m-%d %H:%M:%S"))])
+
+    def save_routes(self, rows):
+        """Insert (username, source, destination, route, saved_at) rows in one transaction."""
+        with self.session() as s:
+            new_ids = self._insert_routes(s, rows)
+            s.commit()
+        self._node_ids.update(new_ids)
+
+    def _insert_routes(self, s: Session, rows):
+        """
+        Intern the locations, upsert each distinct path once, then add one
+        user_routes reference per row. Returns the name -> id entries it looked up
+        (to be cached once the transaction commits).
+        """
+        paths = [_route_names(row[3]) for row in rows]
+        uses = {}
+        for names in paths:
+            for name in names:
+                uses[name] = uses.get(name, 0) + 1
+        # one statement interns new names and bumps the use counts of all of them
+        s.executemany("""
+            INSERT INTO route_nodes (name, uses) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE uses = uses + VALUES(uses)
+        """, list(uses.items()))
+        ids = self._node_ids
+        wanted = [name for name in uses if name not in ids]
+        new_ids = dict(s.query_in("SELECT name, id FROM route_nodes WHERE name IN ({})", wanted))
+        for name in wanted:
+            if name not in new_ids:  # stored under a spelling the collation treats as equal
+                new_ids[name] = s.query("SELECT id FROM route_nodes WHERE name=%s", (name,))[0][0]
+
+        def node_id(name):
+            return ids[name] if name in ids else new_ids[name]
+
+        routes, keys = {}, []   # path hash -> [hash, nodes, source id, destination id, hops, saves]
+        for names in paths:
+            node_ids = [node_id(name) for name in names]
+            nodes = encode_route(node_ids)
+            key = hashlib.blake2b(nodes.encode("ascii"), digest_size=16).digest()
+            if key not in routes:
+                routes[key] = [key, nodes, node_ids[0], node_ids[-1], len(node_ids) - 1, 0]
+            routes[key][5] += 1
+            keys.append(key)
+        s.executemany("""
+            INSERT INTO routes (path_hash, nodes, source_id, destination_id, hops, save_count)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE save_count = save_count + VALUES(save_count)
+        """, list(routes.values()))
+        route_ids = {bytes(key): route_id for key, route_id in
+                     s.query_in("SELECT path_hash, id FROM routes WHERE path_hash IN ({})", list(routes))}
+        s.executemany("INSERT INTO user_routes (username, route_id, saved_at) VALUES (%s, %s, %s)",
+                      [(row[0], route_ids[key], row[4]) for row, key in zip(rows, keys)])
+        return new_ids
+
+    def saved_routes_page(self, username: str, after=None, limit: int = SAVED_ROUTES_PAGE):
+        """
+        One page of (id, source, destination, route_text, saved_at) rows, newest first.
+        after is the (saved_at, id) of the last row already shown; seeking on the
+        (username, saved_at, id) index makes deep pages as cheap as the first one.
+        """
+        with self.session() as s:
+            if after is None:
+                return s.query("""
+                    SELECT id, source, destination, route_text, saved_at
+                    FROM saved_route_texts
+                    WHERE username=%s
+                    ORDER BY saved_at DESC, id DESC
+                    LIMIT %s
+                """, (username, limit))
+            saved_at, last_id = after
+            return s.query("""
+                SELECT id, source, destination, route_text, saved_at
+                FROM saved_route_texts
+                WHERE username=%s AND (saved_at < %s OR (saved_at = %s AND id < %s))
+                ORDER BY saved_at DESC, id DESC
+                LIMIT %s
+            """, (username, saved_at, saved_at, last_id, limit))
+
+    def popular_routes(self, limit: int = 10):
+        """(source, destination, route_text, times saved) of the most-saved routes, across all users."""
+        with self.session() as s:
+            return s.query("""
+                SELECT source, destination, route_text, save_count
+                FROM route_texts
+                ORDER BY save_count DESC, id DESC
+                LIMIT %s
+            """, (limit,))
+
+    def popular_nodes(self, limit: int = 10):
+        """(location, times on a saved route) of the locations saved routes pass through most."""
+        with self.session() as s:
+            return s.query("""
+                SELECT name, uses
+                FROM route_nodes
+                WHERE uses > 0
+                ORDER BY uses DESC, id DESC
+                LIMIT %s
+            """, (limit,))
+
+
+# Write-behind Route Saving
+
+def _row_error(e: Exception):
+    """True when retrying can't help: MySQL refused the data itself, or a spooled row is malformed."""
+    mysql = driver()
+    return isinstance(e, (mysql.DataError, mysql.IntegrityError, ValueError, TypeError, IndexError))
+
+class RouteWriter:
+    """
+    Write-behind queue for saved routes.
+    Usage:
+        writer = RouteWriter(DB, "cache/pending_routes.jsonl")
+        writer.save(user, source, destination, path)   # durable once this returns
+        writer.close()                                        # final flush at exit
+    Each row is appended (and fsync'd) to a local spool file, then a background
+    thread inserts waiting rows with one executemany once batch_size rows are
+    queued or interval seconds have passed. Failed flushes are retried with
+    exponential backoff; rows still spooled at exit (DB down) or after a crash
+    are sent on the next start. A crash between COMMIT and the spool rewrite
+    can send a batch twice, never zero times. Rows MySQL refuses for good (e.g.
+    a name longer than the column) are moved to reject_path instead of
+    blocking every later save.
+    """
+    def __init__(self, db: Database, spool_path: str, batch_size: int = WRITE_BATCH,
+                 interval: float = WRITE_INTERVAL, reject_path: str = None):
+        self.db = db
+        self.spool_path = spool_path
+        self.reject_path = reject_path or os.path.splitext(spool_path)[0] + ".rejected.jsonl"
+        self.batch_size = batch_size
+        self.interval = interval
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()   # one batch in flight at a time
+        self._pending, clean = self._read_spool()
+        os.makedirs(os.path.dirname(spool_path) or ".", exist_ok=True)
+        self._spool = None
+        if clean:
+            self._spool = open(spool_path, "a", encoding="utf-8")
+        else:
+            self._rewrite_spool()  # or the next save() would be glued onto the torn line
+        self._oldest = time.monotonic() if self._pending else None
+        self._failures = 0
+        self._retry_at = 0.0
+        self._closed = False
+        self.last_error = None
+        self.flushed = 0
+        self.rejected = 0
+        self._thread = threading.Thread(target=self._run, name="campus-route-writer", daemon=True)
+        self._thread.start()
+
+    def _read_spool(self):
+        """(rows, clean); clean is False when a line was dropped or the file lacks its final newline."""
+        rows, clean = [], True
+        try:
+            with open(self.spool_path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        clean = False
+                    try:
+                        rows.append(tuple(json.loads(line)))
+                    except ValueError:
+                        clean = False  # torn last line from a crash mid-write
+        except FileNotFoundError:
+            pass
+        return rows, clean
+
+    def _rewrite_spool(self):
+        """Replace the spool with what is still pending (called with _cond held)."""
+        tmp = f"{self.spool_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for row in self._pending:
+                f.write(json.dumps(row) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if self._spool is not None:
+            self._spool.close()
+        os.replace(tmp, self.spool_path)
+        self._spool = open(self.spool_path, "a", encoding="utf-8")
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def save(self, username: str, source: str, destination: str, route):
+        """Queue one route (list of location names); on disk when this returns, in MySQL after the next flush."""
+        row = (username, source, destination, list(route), datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("RouteWriter is closed")
+            self._spool.write(json.dumps(row) + "\n")
+            self._spool.flush()
+            os.fsync(self._spool.fileno())
+            self._pending.append(row)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+                self._cond.notify()  # starts the interval clock
+            elif len(self._pending) == self.batch_size:
+                self._cond.notify()
+
+    def _flush_once(self):
+        """
+        Send up to batch_size rows; False when nothing was pending. Raises if the
+        insert fails for a reason worth retrying (DB down, lost connection).
+        """
+        with self._flush_lock:
+            with self._cond:
+                batch = self._pending[:self.batch_size]
+            if not batch:
+                return False
+            t0 = metrics.start()
+            try:
+                self.db.save_routes(batch)
+            except Exception as e:
+                if not _row_error(e):
+                    raise
+                self._save_one_by_one(batch)  # find the bad rows; the rest still go in
+                return True
+            metrics.elapsed("db.write_behind", t0)
+            metrics.observe("db.write_behind.rows", len(batch))
+            self._done(batch)
+            return True
+
+    def _save_one_by_one(self, batch):
+        for row in batch:
+            try:
+                self.db.save_routes([row])
+            except Exception as e:
+                if not _row_error(e):
+                    raise
+                self._done([row], rejected=e)
+            else:
+                self._done([row])
+
+    def _done(self, rows, rejected: Exception = None):
+        """Drop rows (the head of the queue) once sent, or once set aside in the reject file."""
+        with self._cond:
+            if rejected is not None:
+                with open(self.reject_path, "a", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps({"row": row, "error": str(rejected)}) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.rejected += len(rows)
+                self.last_error = rejected
+            else:
+                self.flushed += len(rows)
+            del self._pending[:len(rows)]  # save() only appends, so the batch is still the prefix
+            self._rewrite_spool()
+            self._oldest = time.monotonic() if self._pending else None
+            self._failures = 0
+
+    def flush(self):
+        """Send everything queued now, from the calling thread (raises if the DB is unavailable)."""
+        while self._flush_once():
+            pass
+
+    def _due(self, now: float):
+        """Seconds until the next flush should start (0 = now, None = nothing queued)."""
+        if not self._pending:
+            return None
+        if self._closed:
+            return 0.0
+        if len(self._pending) >= self.batch_size:
+            due = now
+        else:
+            due = self._oldest + self.interval
+        return max(due, self._retry_at) - now
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    wait = self._due(time.monotonic())
+                    if wait is not None and wait <= 0:
+                        break
+                    if self._closed:
+                        return
+                    self._cond.wait(wait)
+                closing = self._closed
+            try:
+                if closing:
+                    self.flush()
+                else:
+                    self._flush_once()  # then re-check: the rest may not be due yet
+            except Exception as e:
+                with self._cond:
+                    self.last_error = e
+                    self._failures += 1
+                    delay = min(RETRY_MAX, RETRY_BASE * 2 ** (self._failures - 1))
+                    self._retry_at = time.monotonic() + delay * random.uniform(0.5, 1.0)
+                if closing:
+                    return  # DB still down at exit: rows stay spooled for the next start
+            if closing:
+                return
+
+    def close(self, timeout: float = 10):
+        """Flush what is queued (best effort within timeout) and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        with self._cond:
+            self._spool.close()
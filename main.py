@@ -1,151 +1,46 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import mysql.connector
-import heapq
+from tkinter import ttk, messagebox, filedialog
+import os
+import sys
+import threading
 
-# Database
+from campus_graph import CLOSED, CampusGraph, a_star, bidirectional_a_star, k_shortest_paths
+from contraction import ContractionHierarchy
+from db import Database, RouteWriter, SAVED_ROUTES_PAGE, driver
+import metrics
+from mst import IncrementalMST
+from parallel import GraphPool
+from route_table import RouteTable, MAX_TABLE_NODES
+from spatial import SpatialIndex
+from spt_cache import SPTCache
+from tasks import TaskRunner
 
-def connect_db():
-    """Create and return a MySQL connection. Adjust password if needed."""
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",  # <--- set if needed
-        database="campus_navigator"
-    )
+# Find Path engine: "table" (all-pairs cache), "ch" (contraction hierarchies),
+# "astar" or "bidirectional". "table" falls back to "ch" on maps too big for it.
+ROUTING_ENGINE = "table"
 
+# Engine caches (rebuilt automatically when the graph digest changes)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+ROUTE_CACHE = os.path.join(CACHE_DIR, "campus_routes.bin")
+CH_CACHE = os.path.join(CACHE_DIR, "campus.ch")
 
-# Graph Algorithms
+# Saved routes waiting for MySQL (write-behind spool; survives crashes and DB outages)
+ROUTE_SPOOL = os.path.join(CACHE_DIR, "pending_routes.jsonl")
 
-def a_star(graph: dict, start: str, goal: str):
-    """
-    A* without heuristic (acts like Dijkstra on this small graph).
-    Returns (path_nodes_list or None, total_cost).
-    """
-    pq = [(0, start)]
-    came_from = {}
-    cost = {start: 0}
-    while pq:
-        _, u = heapq.heappop(pq)
-        if u == goal:
-            break
-        for v, w in graph[u].items():
-            nd = cost[u] + w
-            if v not in cost or nd < cost[v]:
-                cost[v] = nd
-                came_from[v] = u
-                heapq.heappush(pq, (nd, v))
-    if start == goal:
-        return [start], 0
-    if goal not in came_from:
-        return None, float('inf')
-    # reconstruct
-    path, cur = [], goal
-    while cur != start:
-        path.append(cur)
-        cur = came_from[cur]
-    path.append(start)
-    path.reverse()
-    return path, cost[goal]
-
-def dijkstra_spt(graph: dict, start: str):
-    """
-    Dijkstra shortest-path tree from start.
-    Returns (dist: dict[node->cost], parent: dict[node->parent]).
-    """
-    dist = {u: float('inf') for u in graph}
-    parent = {u: None for u in graph}
-    dist[start] = 0
-    pq = [(0, start)]
-    while pq:
-        d, u = heapq.heappop(pq)
-        if d != dist[u]:
-            continue
-        for v, w in graph[u].items():
-            nd = d + w
-            if nd < dist[v]:
-                dist[v] = nd
-                parent[v] = u
-                heapq.heappush(pq, (nd, v))
-    return dist, parent
-
-def _find(parent, x):
-    if parent[x] != x:
-        parent[x] = _find(parent, parent[x])
-    return parent[x]
-
-def _union(parent, rank, a, b):
-    ra, rb = _find(parent, a), _find(parent, b)
-    if ra == rb:
-        return
-    if rank[ra] < rank[rb]:
-        parent[ra] = rb
-    elif rank[ra] > rank[rb]:
-        parent[rb] = ra
-    else:
-        parent[rb] = ra
-        rank[ra] += 1
-
-def kruskal_mst(graph: dict):
-    """
-    Kruskal MST for an undirected weighted graph (dict of dict).
-    Returns (mst_edges: list[(u,v,w)], total_weight).
-    """
-    edges, seen = [], set()
-    for u in graph:
-        for v, w in graph[u].items():
-            key = tuple(sorted((u, v)))
-            if key in seen:
-                continue
-            seen.add(key)
-            edges.append((w, u, v))
-    edges.sort()
-    parent, rank = {}, {}
-    for u in graph:
-        parent[u] = u
-        rank[u] = 0
-    mst, total = [], 0
-    for w, u, v in edges:
-        if _find(parent, u) != _find(parent, v):
-            _union(parent, rank, u, v)
-            mst.append((u, v, w))
-            total += w
-    return mst, total
-
-
-# Data: Campus Graph + Positions
-
-CAMPUS_GRAPH = {
-    'Front Gate': {'Library': 2, 'Canteen': 4, 'Admin': 3},
-    'Admin': {'Front Gate': 3, 'Library': 2, 'Auditorium': 4, 'Research Block': 5},
-    'Library': {'Front Gate': 2, 'Admin': 2, 'Hostel': 3, 'Lab': 4, 'Research Block': 3},
-    'Hostel': {'Library': 3, 'Lab': 2, 'Sports Complex': 5, 'Parking': 6},
-    'Canteen': {'Front Gate': 4, 'Lab': 3, 'Cultural Center': 4},
-    'Lab': {'Library': 4, 'Hostel': 2, 'Canteen': 3, 'Ground': 5, 'Auditorium': 6, 'Research Block': 4},
-    'Ground': {'Lab': 5, 'Sports Complex': 3, 'Parking': 4, 'Back Gate': 4},
-    'Sports Complex': {'Hostel': 5, 'Ground': 3, 'Parking': 2, 'Back Gate': 5},
-    'Auditorium': {'Admin': 4, 'Lab': 6, 'Cultural Center': 2},
-    'Cultural Center': {'Canteen': 4, 'Auditorium': 2, 'Parking': 5},
-    'Parking': {'Ground': 4, 'Sports Complex': 2, 'Cultural Center': 5, 'Hostel': 6, 'Back Gate': 3},
-    'Research Block': {'Library': 3, 'Lab': 4, 'Admin': 5},
-    'Back Gate': {'Parking': 3, 'Ground': 4, 'Sports Complex': 5}
-}
-
-NODE_POS = {
-    'Front Gate': (60, 180),
-    'Admin': (170, 130),
-    'Library': (250, 60),
-    'Hostel': (420, 40),
-    'Research Block': (330, 100),
-    'Lab': (420, 180),
-    'Canteen': (250, 300),
-    'Ground': (550, 230),
-    'Sports Complex': (620, 90),
-    'Auditorium': (500, 130),
-    'Cultural Center': (400, 330),
-    'Parking': (620, 280),
-    'Back Gate': (740, 200)
-}
+# Shortest-path trees kept for budget / route queries (LRU)
+SPT_CACHE_SIZE = 64
+
+# Routes shown by "Alternatives" (the shortest plus K - 1 runners-up)
+ALTERNATIVE_ROUTES = 3
+
+# Background threads for DB / graph queries (big table rebuilds use TABLE_WORKERS processes)
+IO_WORKERS = 4
+
+# Processes used to (re)build the all-pairs route table on big maps (parallel.GraphPool)
+TABLE_WORKERS = os.cpu_count() or 1
+
+# Search / DB / redraw instrumentation shown in the Stats window (near-zero cost when off)
+METRICS_ENABLED = True
 
 class ScrollablePage(tk.Frame):
     """
@@ -192,6 +87,100 @@ class ScrollablePage(tk.Frame):
         self._canvas.yview_scroll(delta, "units")
 
 
+class VirtualList(tk.Frame):
+    """
+    A vertically scrolling list that only keeps widgets for the rows on screen.
+    Usage:
+        lst = VirtualList(win, render=lambda i, row: f"{i}. {row}", load_more=fetch_next)
+        lst.pack(fill="both", expand=True)
+        lst.extend(rows)   # append rows; load_more() is called as the user nears the end
+        lst.finish()       # no more pages
+    Every row has the same height (ROW_HEIGHT) and labels are recycled while scrolling.
+    """
+    ROW_HEIGHT = 64
+    PREFETCH_ROWS = 10
+
+    def __init__(self, master, render, load_more=None, bg="#121212", row_bg="#1f1f1f",
+                 fg="white", font=("Consolas", 9)):
+        super().__init__(master, bg=bg)
+        self.items = []
+        self._render = render
+        self._load_more = load_more
+        self._loading = False
+        self._row_opts = dict(fg=fg, bg=row_bg, anchor="w", justify="left", font=font, padx=10, pady=6)
+        self._visible = {}   # row index -> (label, canvas window id)
+        self._spare = []     # hidden (label, window id) pairs ready for reuse
+
+        self._canvas = tk.Canvas(self, bg=bg, highlightthickness=0,
+                                 yscrollincrement=self.ROW_HEIGHT // 2)
+        self._vbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self._canvas.configure(yscrollcommand=self._vbar.set)
+        self._vbar.pack(side="right", fill="y")
+        self._canvas.pack(side="left", fill="both", expand=True)
+
+        self._canvas.bind("<Configure>", lambda e: self._refresh(resized=True))
+        self._bind_wheel(self._canvas)
+
+    def _bind_wheel(self, widget):
+        # local bindings + "break" so the page behind (ScrollablePage) does not scroll too
+        widget.bind("<MouseWheel>", lambda e: self._scroll(int(-1 * (e.delta / 120))))
+        widget.bind("<Button-4>", lambda e: self._scroll(-1))
+        widget.bind("<Button-5>", lambda e: self._scroll(1))
+
+    def _scroll(self, units: int):
+        self._canvas.yview_scroll(units, "units")
+        self._refresh()
+        return "break"
+
+    def _on_scrollbar(self, *args):
+        self._canvas.yview(*args)
+        self._refresh()
+
+    def extend(self, rows):
+        self.items.extend(rows)
+        self._loading = False
+        self._canvas.configure(scrollregion=(0, 0, 0, len(self.items) * self.ROW_HEIGHT))
+        self._refresh()
+
+    def finish(self):
+        self._load_more = None
+
+    def _refresh(self, resized=False):
+        c, rh = self._canvas, self.ROW_HEIGHT
+        top = c.canvasy(0)
+        first = max(0, int(top // rh))
+        last = min(len(self.items), int((top + c.winfo_height()) // rh) + 1)
+
+        # recycle rows that scrolled out of view
+        for i in [i for i in self._visible if not first <= i < last]:
+            label, wid = self._visible.pop(i)
+            c.itemconfigure(wid, state="hidden")
+            self._spare.append((label, wid))
+
+        width = max(1, c.winfo_width() - 12)
+        if resized:
+            for _, wid in self._visible.values():
+                c.itemconfigure(wid, width=width)
+        for i in range(first, last):
+            if i in self._visible:
+                continue
+            if self._spare:
+                label, wid = self._spare.pop()
+                c.coords(wid, 6, i * rh + 2)
+                c.itemconfigure(wid, state="normal", width=width)
+            else:
+                label = tk.Label(c, **self._row_opts)
+                self._bind_wheel(label)
+                wid = c.create_window(6, i * rh + 2, window=label, anchor="nw",
+                                      width=width, height=rh - 4)
+            label.config(text=self._render(i, self.items[i]))
+            self._visible[i] = (label, wid)
+
+        if self._load_more and not self._loading and last >= len(self.items) - self.PREFETCH_ROWS:
+            self._loading = True
+            self._load_more()
+
+
 # GUI App
 
 class CampusNavigatorApp:
@@ -211,17 +200,65 @@ class CampusNavigatorApp:
     NODE_OUTLINE = "#1B4F72"
     NODE_REACHABLE = "#FFD54F"
 
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, graph: CampusGraph, db: Database):
         self.root = root
+        self.graph = graph
+        self.db = db
         self.root.title("Campus Navigator - Smart Path Finder")
         self.root.geometry("920x640")
         self.root.configure(bg=self.BG_MAIN)
         self.current_user = None
+        # one set of table-building processes for the session, started on first use
+        self.pool = GraphPool(self.graph, TABLE_WORKERS)
+        self._router_lock = threading.Lock()  # rebuilds share the pool: one at a time
+        self.find_route = self._load_router(ROUTING_ENGINE)
+        self.spt_cache = SPTCache(self.graph, maxsize=SPT_CACHE_SIZE)
+        self.mst = IncrementalMST(self.graph)
+        self.spatial = SpatialIndex(self.graph)
+        self.routes = RouteWriter(self.db, ROUTE_SPOOL)
+        self.tasks = TaskRunner(root, io_workers=IO_WORKERS, on_busy=self._set_busy)
+        self.status_label = None
         self._build_login()
 
+    def _load_router(self, engine: str, graph: CampusGraph = None):
+        """
+        Return a (start, goal) -> (path, cost) callable for the chosen engine.
+        Table / CH come from the cache file for the map as loaded; for an edited
+        graph (a snapshot() rebuilt in the background) they are built in memory
+        only, since edits are not saved and the cache must stay valid for the next start.
+        """
+        if engine == "table" and len(self.graph) > MAX_TABLE_NODES:
+            engine = "ch"
+        if engine in ("table", "ch"):
+            cls, path = (RouteTable, ROUTE_CACHE) if engine == "table" else (ContractionHierarchy, CH_CACHE)
+            options = {"pool": self.pool} if engine == "table" else {}
+            with self._router_lock:
+                if graph is not None:
+                    store = cls.load(graph, path) or cls.build(graph, **options)  # cache fits again once edits are undone
+                else:
+                    try:
+                        store = cls.load_or_build(self.graph, path, **options)
+                    except OSError:
+                        store = cls.build(self.graph, **options)  # read-only install dir: keep it in memory
+            return store.path if engine == "table" else store.query
+        if engine == "bidirectional":
+            return lambda start, goal: bidirectional_a_star(self.graph, start, goal)
+        return lambda start, goal: a_star(self.graph, start, goal)
+
+    def _set_busy(self, busy: bool):
+        """Busy indicator while background tasks are pending."""
+        self.root.configure(cursor="watch" if busy else "")
+        if self.status_label is not None:
+            self.status_label.config(text="⏳ Working..." if busy else "")
+
+    def _show_error(self, exc: Exception):
+        messagebox.showerror("Error", str(exc))
+
     # Login 
     def _build_login(self):
         """Build login/sign-up screen (also inside a scrollable page for consistency)."""
+        # results for the previous screen are no longer wanted; the rebuilt router still is
+        self.tasks.cancel_all(keep=("router",))
         for w in self.root.winfo_children():
             w.destroy()
 
@@ -240,34 +277,32 @@ class CampusNavigatorApp:
         entry_pass.pack(pady=5)
 
         def do_login():
-            conn = connect_db()
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM users WHERE username=%s AND password=%s",
-                        (entry_user.get(), entry_pass.get()))
-            row = cur.fetchone()
-            conn.close()
-            if row:
-                self.current_user = entry_user.get()
-                messagebox.showinfo("Success", "Login Successful!")
-                self._build_main()
-            else:
-                messagebox.showerror("Error", "Invalid Credentials")
+            user = entry_user.get()
+
+            def done(ok):
+                if ok:
+                    self.current_user = user
+                    messagebox.showinfo("Success", "Login Successful!")
+                    self._build_main()
+                else:
+                    messagebox.showerror("Error", "Invalid Credentials")
+            self.tasks.submit("auth", self.db.check_login, user, entry_pass.get(),
+                              on_done=done, on_error=self._show_error)
 
         def do_signup():
-            conn = connect_db()
-            cur = conn.cursor()
-            try:
-                cur.execute("INSERT INTO users (username, password) VALUES (%s, %s)",
-                            (entry_user.get(), entry_pass.get()))
-                conn.commit()
-                messagebox.showinfo("Success", "Account Created Successfully!")
-            except:
-                messagebox.showerror("Error", "Username already exists!")
-            conn.close()
+            def done(created):
+                if created:
+                    messagebox.showinfo("Success", "Account Created Successfully!")
+                else:
+                    messagebox.showerror("Error", "Username already exists!")
+            self.tasks.submit("auth", self.db.create_user, entry_user.get(), entry_pass.get(),
+                              on_done=done, on_error=self._show_error)
 
         tk.Button(container, text="Login", command=do_login, bg="#2980B9", fg="white", width=10).pack(pady=10)
         tk.Button(container, text="Sign Up", command=do_signup, bg="#27AE60", fg="white", width=10).pack(pady=5)
         tk.Button(container, text="Exit", command=self.root.quit, bg="#C0392B", fg="white", width=10).pack(pady=10)
+        self.status_label = tk.Label(container, text="", bg=self.BG_MAIN, font=("Arial", 10))
+        self.status_label.pack()
 
     # Main 
     def _build_main(self):
@@ -289,11 +324,11 @@ class CampusNavigatorApp:
 
         tk.Label(ctrl, text="Source:", bg=self.BG_PANEL).grid(row=0, column=0, padx=6, pady=8, sticky="e")
         self.src_var = tk.StringVar()
-        ttk.Combobox(ctrl, textvariable=self.src_var, values=list(CAMPUS_GRAPH.keys())).grid(row=0, column=1, padx=6, pady=8)
+        ttk.Combobox(ctrl, textvariable=self.src_var, values=list(self.graph.names)).grid(row=0, column=1, padx=6, pady=8)
 
         tk.Label(ctrl, text="Destination:", bg=self.BG_PANEL).grid(row=1, column=0, padx=6, pady=8, sticky="e")
         self.dst_var = tk.StringVar()
-        ttk.Combobox(ctrl, textvariable=self.dst_var, values=list(CAMPUS_GRAPH.keys())).grid(row=1, column=1, padx=6, pady=8)
+        ttk.Combobox(ctrl, textvariable=self.dst_var, values=list(self.graph.names)).grid(row=1, column=1, padx=6, pady=8)
 
         tk.Label(ctrl, text="Budget Distance:", bg=self.BG_PANEL).grid(row=0, column=2, padx=6, pady=8, sticky="e")
         self.budget_var = tk.StringVar(value="8")
@@ -306,6 +341,23 @@ class CampusNavigatorApp:
                   command=self._on_show_mst).grid(row=2, column=1, padx=6, pady=10)
         tk.Button(ctrl, text="Within Budget (Dijkstra)", bg="#8e44ad", fg="white", width=20,
                   command=self._on_show_reachable).grid(row=2, column=2, padx=6, pady=10)
+        tk.Button(ctrl, text="Alternatives", bg="#16A085", fg="white", width=12,
+                  command=self._on_find_alternatives).grid(row=2, column=3, padx=6, pady=10)
+
+        # Path edits: act on the path directly between Source and Destination
+        tk.Label(ctrl, text="Congestion ×:", bg=self.BG_PANEL).grid(row=1, column=2, padx=6, pady=8, sticky="e")
+        self.congestion_var = tk.StringVar(value="1.5")
+        tk.Entry(ctrl, textvariable=self.congestion_var, width=10).grid(row=1, column=3, padx=6, pady=8)
+        tk.Button(ctrl, text="Congest Path", bg="#E67E22", fg="white", width=16,
+                  command=self._on_congest_edge).grid(row=3, column=0, padx=6, pady=(0, 10))
+        tk.Button(ctrl, text="Close Path", bg="#C0392B", fg="white", width=16,
+                  command=lambda: self._edit_edge(lambda a, b: CLOSED)).grid(row=3, column=1, padx=6, pady=(0, 10))
+        tk.Button(ctrl, text="Reopen Path", bg="#7F8C8D", fg="white", width=20,
+                  command=lambda: self._edit_edge(self.graph.base_weight)).grid(row=3, column=2, padx=6, pady=(0, 10))
+
+        # Busy indicator (background tasks)
+        self.status_label = tk.Label(container, text="", bg=self.BG_MAIN, font=("Arial", 10))
+        self.status_label.pack()
 
         # Results text
         self.result_label = tk.Label(container, text="", bg=self.BG_MAIN, font=("Arial", 12), justify="left")
@@ -316,6 +368,7 @@ class CampusNavigatorApp:
         map_frame.pack(pady=6, padx=10, fill="x")
         self.map_canvas = tk.Canvas(map_frame, bg="white", width=880, height=400)
         self.map_canvas.pack()
+        self._init_map_view()
 
         # Bottom bar: Logout + View Saved Routes (always visible in page)
         bottom = tk.Frame(container, bg=self.BG_MAIN)
@@ -323,86 +376,281 @@ class CampusNavigatorApp:
         tk.Button(bottom, text="Logout", command=self._build_login, bg="#C0392B", fg="white", width=12).pack(side="left", padx=6)
         tk.Button(bottom, text="📋 View Saved Routes", command=self._on_view_saved_routes,
                   bg="#3498db", fg="white", width=18).pack(side="left", padx=6)
+        tk.Button(bottom, text="📊 Stats", command=self._on_view_stats,
+                  bg="#34495e", fg="white", width=12).pack(side="left", padx=6)
 
         # Initial draw
         self._draw_map()
 
     
     # Drawing
-    
+    #
+    # The map is kept as tagged canvas layers, bottom to top:
+    #   edges, weights (base map) | mst, spt, alt, path (overlays) | nodes
+    # Each layer maps a key (edge id pair / node id) to its canvas items, and
+    # _sync_layer() only creates, deletes, moves or restyles what changed.
+    # Everything is culled to the viewport through the spatial index; weights
+    # and node names are hidden when zoomed out (Ctrl+wheel zooms, drag pans,
+    # double-click resets). Clicking a location picks it as Source,
+    # Shift+click as Destination.
+
+    LAYERS = ("edges", "weights", "mst", "spt", "alt", "path", "nodes")
+    OVERLAYS = ("mst", "spt", "alt", "path")
+    OVERLAY_COLORS = {"mst": "green", "spt": "#ff8c00", "path": "blue"}
+    ALT_COLORS = ("purple", "dark cyan", "magenta", "brown", "olive drab")  # 2nd, 3rd, ... route
+    WEIGHT_LABEL_MIN_ZOOM = 0.6
+    NODE_LABEL_MIN_ZOOM = 0.35
+    ZOOM_STEP = 1.2
+    CLICK_SLOP = 4        # pointer travel (px) that still counts as a click, not a drag
+    PICK_RADIUS = 30      # how far (screen px) a click may land from a location
+
     def _node_bbox(self, name: str, x: int, y: int):
         """Compute ellipse bounds based on name length so text fits nicely."""
         half_w = max(25, 10 + 4 * len(name))   # horizontal radius grows with label length
         half_h = 18                             # vertical radius (constant looks good)
         return (x - half_w, y - half_h, x + half_w, y + half_h)
 
-    def _draw_map(self, path=None, mst=None, spt=None, reachable=None):
+    def _init_map_view(self):
+        """Fresh canvas: empty layers, identity view, pan/zoom bindings."""
+        self._layers = {name: {} for name in self.LAYERS}
+        self._overlays = {name: {} for name in self.OVERLAYS}
+        self._reach = set()
+        self._zoom, self._pan = 1.0, (0.0, 0.0)
+        self._drag = self._press = None
+        c = self.map_canvas
+        c.bind("<ButtonPress-1>", self._on_map_press)
+        c.bind("<B1-Motion>", self._on_map_drag)
+        c.bind("<ButtonRelease-1>", self._on_map_release)
+        c.bind("<Double-Button-1>", lambda e: self._set_view(1.0, (0.0, 0.0)))
+        c.bind("<Control-MouseWheel>", lambda e: self._zoom_at(e.x, e.y, e.delta > 0))
+        c.bind("<Control-Button-4>", lambda e: self._zoom_at(e.x, e.y, True))
+        c.bind("<Control-Button-5>", lambda e: self._zoom_at(e.x, e.y, False))
+
+    def _on_map_press(self, event):
+        self._drag = self._press = (event.x, event.y)
+
+    def _on_map_drag(self, event):
+        if self._drag is None:
+            return
+        dx, dy = event.x - self._drag[0], event.y - self._drag[1]
+        self._drag = (event.x, event.y)
+        self._set_view(self._zoom, (self._pan[0] + dx, self._pan[1] + dy))
+
+    def _on_map_release(self, event):
+        press, self._press = self._press, None
+        if press is None or max(abs(event.x - press[0]), abs(event.y - press[1])) > self.CLICK_SLOP:
+            return
+        wx, wy = (event.x - self._pan[0]) / self._zoom, (event.y - self._pan[1]) / self._zoom
+        u = self.spatial.nearest(wx, wy, max_dist=self.PICK_RADIUS / self._zoom)
+        if u == -1:
+            return
+        name = self.graph.names[u]
+        if event.state & 0x0001:  # Shift
+            self.dst_var.set(name)
+            self.result_label.config(text=f"Destination: {name}")
+        else:
+            self.src_var.set(name)
+            self.result_label.config(text=f"Source: {name}")
+
+    def _zoom_at(self, x: int, y: int, zoom_in: bool):
+        """Zoom around the pointer so the spot under it stays put."""
+        factor = self.ZOOM_STEP if zoom_in else 1 / self.ZOOM_STEP
+        zoom = self._zoom * factor
+        px, py = self._pan
+        self._set_view(zoom, (x - (x - px) * factor, y - (y - py) * factor))
+        return "break"  # don't let the page behind scroll
+
+    def _set_view(self, zoom: float, pan):
+        self._zoom, self._pan = zoom, pan
+        self._render(moved=True)
+
+    def _screen(self, u: int):
+        x, y = self.graph.pos(u)
+        return x * self._zoom + self._pan[0], y * self._zoom + self._pan[1]
+
+    def _world_viewport(self, margin: float):
+        """Visible area in map coordinates, grown by margin screen pixels."""
+        c, z = self.map_canvas, self._zoom
+        w, h = int(c.cget("width")), int(c.cget("height"))
+        px, py = self._pan
+        return ((-margin - px) / z, (-margin - py) / z, (w + margin - px) / z, (h + margin - py) / z)
+
+    def _sync_layer(self, layer: str, wanted: dict, create, update, moved: bool):
+        """
+        Make layer show exactly the keys in wanted ({key: style}).
+        create(key, style) -> item ids; update(ids, key, style, old_style, moved) restyles/moves.
+        Returns True if any item was created (stacking order needs fixing).
+        """
+        c, items = self.map_canvas, self._layers[layer]
+        for key in [k for k in items if k not in wanted]:
+            c.delete(*items.pop(key)[0])
+        created = False
+        for key, style in wanted.items():
+            entry = items.get(key)
+            if entry is None:
+                items[key] = (create(key, style), style)
+                created = True
+            elif moved or entry[1] != style:
+                update(entry[0], key, style, entry[1], moved)
+                items[key] = (entry[0], style)
+        return created
+
+    def _arrow(self, x1, y1, x2, y2):
+        """Small direction arrow 70% along the segment (None for zero length)."""
+        dx, dy = x2 - x1, y2 - y1
+        L = (dx*dx + dy*dy) ** 0.5
+        if not L:
+            return None
+        ux, uy = dx / L, dy / L
+        ax, ay = x1 + 0.7 * dx, y1 + 0.7 * dy
+        s = 8
+        return (ax, ay,
+                ax - uy * s + ux * s / 2, ay + ux * s + uy * s / 2,
+                ax + uy * s + ux * s / 2, ay - ux * s + uy * s / 2)
+
+    def _draw_map(self, path=None, mst=None, spt=None, reachable=None, alternatives=None):
         """
-        Draw the whole map:
+        Show the map with the given overlays (replacing the previous ones):
           - Gray edges (+weights)
           - Optional MST edges (green)
           - Optional SPT edges (orange) and reachable nodes (yellow)
-          - Optional path (blue) for A*
+          - Optional path (blue) for A*, and alternative routes (ALT_COLORS, in order)
         """
-        c = self.map_canvas
-        c.delete("all")
-
-        # Base edges + weights
-        drawn = set()
-        for u in CAMPUS_GRAPH:
-            for v, w in CAMPUS_GRAPH[u].items():
-                key = tuple(sorted((u, v)))
-                if key in drawn:
-                    continue
-                drawn.add(key)
-                x1, y1 = NODE_POS[u]
-                x2, y2 = NODE_POS[v]
-                c.create_line(x1, y1, x2, y2, fill="gray", width=1)
-                c.create_text((x1 + x2)//2, (y1 + y2)//2, text=str(w), font=("Arial", 8))
-
-        # MST (green)
-        if mst:
-            for u, v, _ in mst:
-                x1, y1 = NODE_POS[u]
-                x2, y2 = NODE_POS[v]
-                c.create_line(x1, y1, x2, y2, fill="green", width=3)
-
-        # SPT (orange)
-        if spt:
-            for u, v in spt:
-                x1, y1 = NODE_POS[u]
-                x2, y2 = NODE_POS[v]
-                c.create_line(x1, y1, x2, y2, fill="#ff8c00", width=3)
-
-        # Path (blue) + direction arrow
-        if path and len(path) > 1:
-            for i in range(len(path) - 1):
-                a, b = path[i], path[i + 1]
-                if a in NODE_POS and b in NODE_POS:
-                    x1, y1 = NODE_POS[a]
-                    x2, y2 = NODE_POS[b]
-                    c.create_line(x1, y1, x2, y2, fill="blue", width=3)
-                    # small arrow
-                    dx, dy = x2 - x1, y2 - y1
-                    L = (dx*dx + dy*dy) ** 0.5
-                    if L:
-                        ux, uy = dx / L, dy / L
-                        ax, ay = x1 + 0.7 * dx, y1 + 0.7 * dy
-                        s = 8
-                        c.create_polygon(
-                            ax, ay,
-                            ax - uy * s + ux * s / 2, ay + ux * s + uy * s / 2,
-                            ax + uy * s + ux * s / 2, ay - ux * s + uy * s / 2,
-                            fill="blue"
-                        )
-
-        # Nodes (reachable yellow else blue)
-        reach = set(reachable) if reachable else set()
-        for name, (x, y) in NODE_POS.items():
-            x0, y0, x1, y1 = self._node_bbox(name, x, y)
-            fill = self.NODE_REACHABLE if name in reach else self.NODE_FILL
-            c.create_oval(x0, y0, x1, y1, fill=fill, outline=self.NODE_OUTLINE, width=2)
-            c.create_text(x, y, text=name, fill="white", font=("Arial", 10, "bold"))
+        index = self.graph.index
+
+        def keys(edges, color):
+            return {(index[a], index[b]): color for a, b in edges if a in index and b in index}
+
+        alt = {}
+        for rank in reversed(range(len(alternatives or ()))):  # better-ranked colors win shared segments
+            p = alternatives[rank]
+            alt.update(keys(zip(p, p[1:]), self.ALT_COLORS[rank % len(self.ALT_COLORS)]))
+        self._overlays = {
+            "mst": keys(((u, v) for u, v, _ in mst or ()), self.OVERLAY_COLORS["mst"]),
+            "spt": keys(spt or (), self.OVERLAY_COLORS["spt"]),
+            "alt": alt,
+            "path": keys(zip(path, path[1:]) if path else (), self.OVERLAY_COLORS["path"]),
+        }
+        self._reach = {index[u] for u in reachable or () if u in index}
+        self._render()
+
+    def _render(self, moved: bool = False):
+        """Bring every layer in line with the current overlays and view."""
+        t0 = metrics.start()
+        c, zoom = self.map_canvas, self._zoom
+        xs, ys = self.graph.xs, self.graph.ys
+        x0, y0, x1, y1 = self._world_viewport(margin=60)
+
+        def seg_visible(u, v):
+            return not (max(xs[u], xs[v]) < x0 or min(xs[u], xs[v]) > x1
+                        or max(ys[u], ys[v]) < y0 or min(ys[u], ys[v]) > y1)
+
+        def seg(ids, key, *_):
+            c.coords(ids[0], *self._screen(key[0]), *self._screen(key[1]))
+
+        # Base edges + weights (closed paths red and dashed; restyled in place when edited)
+        def edge_style(w):
+            return dict(fill="red", dash=(4, 3)) if w == CLOSED else dict(fill="gray", dash="")
+
+        def update_edge(ids, key, w, old, moved):
+            if moved:
+                seg(ids, key)
+            if w != old:
+                c.itemconfigure(ids[0], **edge_style(w))
+
+        edges = {(u, v): w for u, v, w in self.spatial.edges_in(x0, y0, x1, y1) if seg_visible(u, v)}
+        created = self._sync_layer(
+            "edges", edges,
+            lambda key, w: [c.create_line(*self._screen(key[0]), *self._screen(key[1]),
+                                          width=1, tags="edges", **edge_style(w))],
+            update_edge, moved)
+
+        def mid(key):
+            (ax, ay), (bx, by) = self._screen(key[0]), self._screen(key[1])
+            return (ax + bx) / 2, (ay + by) / 2
+
+        def label(w):
+            return dict(text="closed", fill="red") if w == CLOSED else dict(text=f"{w:g}", fill="black")
+
+        def update_weight(ids, key, w, old, moved):
+            if moved:
+                c.coords(ids[0], *mid(key))
+            if w != old:
+                c.itemconfigure(ids[0], **label(w))
+
+        weights = edges if zoom >= self.WEIGHT_LABEL_MIN_ZOOM else {}
+        created |= self._sync_layer(
+            "weights", weights,
+            lambda key, w: [c.create_text(*mid(key), font=("Arial", 8), tags="weights", **label(w))],
+            update_weight, moved)
+
+        # Overlays: MST (green), SPT (orange), alternatives, path (blue); routes get direction arrows
+        for layer in self.OVERLAYS:
+            wanted = {key: color for key, color in self._overlays[layer].items() if seg_visible(*key)}
+
+            def create(key, color, layer=layer):
+                p1, p2 = self._screen(key[0]), self._screen(key[1])
+                ids = [c.create_line(*p1, *p2, fill=color, width=3, tags=layer)]
+                arrow = self._arrow(*p1, *p2) if layer in ("alt", "path") else None
+                if arrow:
+                    ids.append(c.create_polygon(*arrow, fill=color, tags=layer))
+                return ids
+
+            def update(ids, key, color, old, moved):
+                if color != old:
+                    for item in ids:
+                        c.itemconfigure(item, fill=color)
+                if not moved:
+                    return
+                p1, p2 = self._screen(key[0]), self._screen(key[1])
+                c.coords(ids[0], *p1, *p2)
+                if len(ids) > 1:
+                    arrow = self._arrow(*p1, *p2)
+                    if arrow:
+                        c.coords(ids[1], *arrow)
+            created |= self._sync_layer(layer, wanted, create, update, moved)
+
+        # Nodes (reachable yellow else blue); small dots without names when zoomed out
+        labeled = zoom >= self.NODE_LABEL_MIN_ZOOM
+        names, reach = self.graph.names, self._reach
+        nodes = {u: (u in reach, labeled) for u in self.spatial.query(x0, y0, x1, y1)}
+
+        def node_box(u, labeled):
+            x, y = self._screen(u)
+            return self._node_bbox(names[u], x, y) if labeled else (x - 4, y - 4, x + 4, y + 4)
+
+        def create_node(u, style):
+            reachable, labeled = style
+            fill = self.NODE_REACHABLE if reachable else self.NODE_FILL
+            ids = [c.create_oval(*node_box(u, labeled), fill=fill, outline=self.NODE_OUTLINE,
+                                 width=2 if labeled else 1, tags="nodes")]
+            if labeled:
+                ids.append(c.create_text(*self._screen(u), text=names[u], fill="white",
+                                         font=("Arial", 10, "bold"), tags="nodes"))
+            return ids
+
+        def update_node(ids, u, style, old, moved):
+            if style[1] != old[1]:  # level of detail changed: rebuild this node
+                c.delete(*ids)
+                ids[:] = create_node(u, style)
+                return
+            if style[0] != old[0]:
+                c.itemconfigure(ids[0], fill=self.NODE_REACHABLE if style[0] else self.NODE_FILL)
+            if moved:
+                c.coords(ids[0], *node_box(u, style[1]))
+                if len(ids) > 1:
+                    c.coords(ids[1], *self._screen(u))
+        created |= self._sync_layer("nodes", nodes, create_node, update_node, moved)
+
+        if created:
+            # restore stacking: base map at the bottom, then overlays, nodes on top
+            c.tag_lower("weights")
+            c.tag_lower("edges")
+            for layer in self.OVERLAYS + ("nodes",):
+                c.tag_raise(layer)
+        if metrics.ENABLED:
+            metrics.elapsed("draw", t0)
+            metrics.observe("draw.items", sum(len(items) for items in self._layers.values()))
 
     
     # Actions
@@ -413,25 +661,66 @@ class CampusNavigatorApp:
         if not start or not goal:
             messagebox.showwarning("Warning", "Please select both source and destination!")
             return
-        path, cost = a_star(CAMPUS_GRAPH, start, goal)
+        self.tasks.submit("graph", self._route, start, goal,
+                          on_done=lambda res: self._show_path(start, goal, *res),
+                          on_error=self._show_error)
+
+    def _route(self, start: str, goal: str):
+        """Worker: (path, cost), reusing a budget query's tree if we have one."""
+        with metrics.timer("route"):
+            route = self.spt_cache.route(start, goal)
+            return route if route is not None else self.find_route(start, goal)
+
+    def _show_path(self, start: str, goal: str, path, cost):
         if not path:
             self.result_label.config(text="No Path Found!")
             self._draw_map()
             return
         self._draw_map(path=path)
         route_text = " -> ".join(path)
-        self.result_label.config(text=f"Shortest Path (A*): {route_text}\nTotal Distance: {cost}")
+        self.result_label.config(text=f"Shortest Path (A*): {route_text}\nTotal Distance: {cost:g}")
         # Small save button below results (stays in scrollable page)
         tk.Button(self.result_label.master, text="💾 Save Route", bg="#2ecc71", fg="white",
-                  command=lambda: self._save_route(start, goal, route_text)).pack(pady=4)
+                  command=lambda: self._save_route(start, goal, path)).pack(pady=4)
+
+    def _on_find_alternatives(self):
+        """Shortest route plus runners-up (k shortest loopless paths), each in its own color."""
+        start, goal = self.src_var.get(), self.dst_var.get()
+        if not start or not goal:
+            messagebox.showwarning("Warning", "Please select both source and destination!")
+            return
+        self.tasks.submit("graph", self._alternatives, start, goal,
+                          on_done=lambda routes: self._show_alternatives(start, goal, routes),
+                          on_error=self._show_error)
+
+    def _alternatives(self, start: str, goal: str):
+        """Worker: [(path, cost)]; the goal's cached tree guides (and often replaces) the spur searches."""
+        with metrics.timer("alternatives"):
+            tree = self.spt_cache.tree(goal)
+            return k_shortest_paths(self.graph, start, goal, ALTERNATIVE_ROUTES, (tree.dist, tree.parent))
+
+    def _show_alternatives(self, start: str, goal: str, routes):
+        if not routes:
+            self.result_label.config(text="No Path Found!")
+            self._draw_map()
+            return
+        self._draw_map(path=routes[0][0], alternatives=[p for p, _ in routes[1:]])
+        lines = [f"1. (blue) {' -> '.join(routes[0][0])}  [{routes[0][1]:g}]"]
+        for rank, (path, cost) in enumerate(routes[1:]):
+            color = self.ALT_COLORS[rank % len(self.ALT_COLORS)]
+            lines.append(f"{rank + 2}. ({color}) {' -> '.join(path)}  [{cost:g}]")
+        self.result_label.config(text="Routes, shortest first:\n" + "\n".join(lines))
 
     def _on_show_mst(self):
-        """Build and draw MST (Kruskal)."""
-        mst, total = kruskal_mst(CAMPUS_GRAPH)
+        """Draw the MST (Kruskal once, then patched after path edits)."""
+        self.tasks.submit("graph", self.mst.result,
+                          on_done=lambda res: self._show_mst(*res), on_error=self._show_error)
+
+    def _show_mst(self, mst, total):
         self._draw_map(mst=mst)
-        edges_text = "\n".join([f"{u} - {v} ({w})" for u, v, w in mst])
+        edges_text = "\n".join([f"{u} - {v} ({w:g})" for u, v, w in mst])
         messagebox.showinfo("Minimum Spanning Tree",
-                            f"{edges_text}\n\nTotal Weight: {total}")
+                            f"{edges_text}\n\nTotal Weight: {total:g}")
 
     def _on_show_reachable(self):
         """Dijkstra reachability: show nodes within the given budget from Source."""
@@ -446,120 +735,190 @@ class CampusNavigatorApp:
         except ValueError:
             messagebox.showwarning("Invalid Input", "Enter a valid non-negative budget.")
             return
+        self.tasks.submit("graph", self.spt_cache.tree, start,
+                          on_done=lambda tree: self._show_reachable(start, budget, tree),
+                          on_error=self._show_error)
 
-        dist, parent = dijkstra_spt(CAMPUS_GRAPH, start)
-        reachable = sorted([u for u, d in dist.items() if d <= budget], key=lambda x: dist[x])
+    def _show_reachable(self, start: str, budget: float, tree):
+        names, dist, parent = self.graph.names, tree.dist, tree.parent
+        reachable_ids = tree.within(budget)
+        reachable = [names[u] for u in reachable_ids]
 
         # Collect SPT edges only for nodes that are actually reachable
         spt_edges = []
-        for u in reachable:
-            if parent[u] is not None:
-                spt_edges.append((parent[u], u))
+        for u in reachable_ids:
+            if parent[u] != -1:
+                spt_edges.append((names[parent[u]], names[u]))
 
         self._draw_map(spt=spt_edges, reachable=reachable)
         if reachable:
-            listing = "\n".join([f"• {u} (dist {dist[u]})" for u in reachable])
+            listing = "\n".join([f"• {names[u]} (dist {dist[u]:g})" for u in reachable_ids])
             self.result_label.config(text=f"Reachable within {budget} from {start}:\n{listing}")
         else:
             self.result_label.config(text=f"No locations reachable within {budget} from {start}.")
 
     
+    # Path Closures / Congestion
+
+    def _on_congest_edge(self):
+        try:
+            factor = float(self.congestion_var.get())
+            if factor <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showwarning("Invalid Input", "Enter a positive congestion factor.")
+            return
+        self._edit_edge(lambda a, b: self.graph.base_weight(a, b) * factor)
+
+    def _edit_edge(self, new_weight):
+        """
+        Re-weight the path between Source and Destination: new_weight(a, b) -> weight.
+        Cached Dijkstra trees repair themselves on next use; the route engine is
+        rebuilt in the background (plain A* answers in the meantime).
+        """
+        a, b = self.src_var.get(), self.dst_var.get()
+        if not a or not b:
+            messagebox.showwarning("Warning", "Select the two ends of a path as Source and Destination!")
+            return
+        try:
+            self.graph.set_weight(a, b, new_weight(a, b))
+        except KeyError:
+            messagebox.showwarning("Warning", f"{a} and {b} are not directly connected.")
+            return
+        self.tasks.cancel("graph")  # results computed on the old weights are stale
+        self.find_route = lambda start, goal: a_star(self.graph, start, goal)
+        self.tasks.submit("router", self._load_router, ROUTING_ENGINE, self.graph.snapshot(),
+                          on_done=lambda router: setattr(self, "find_route", router),
+                          on_error=self._show_error)
+        w = self.graph.weight(a, b)
+        self.result_label.config(text=f"Path {a} - {b} is closed." if w == CLOSED
+                                 else f"Path {a} - {b} now costs {w:g}.")
+        self._draw_map()
+
+    
     # Saved Routes (SQL)
     
-    def _ensure_saved_routes_table(self):
-        conn = connect_db()
-        cur = conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS saved_routes (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                username VARCHAR(50),
-                source VARCHAR(50),
-                destination VARCHAR(50),
-                route_text TEXT,
-                saved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.commit()
-        conn.close()
-
-    def _save_route(self, source: str, destination: str, route_text: str):
-        """Save the current route to MySQL."""
+    def _save_route(self, source: str, destination: str, path):
+        """Queue the current route; it is on disk now and reaches MySQL with the next batch."""
         try:
-            self._ensure_saved_routes_table()
-            conn = connect_db()
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO saved_routes (username, source, destination, route_text)
-                VALUES (%s, %s, %s, %s)
-            """, (self.current_user, source, destination, route_text))
-            conn.commit()
-            conn.close()
-            messagebox.showinfo("Saved", "Route saved successfully!")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+            self.routes.save(self.current_user, source, destination, path)
+        except OSError as e:
+            self._show_error(e)
+            return
+        messagebox.showinfo("Saved", "Route saved successfully!")
 
     def _on_view_saved_routes(self):
         """Show a scrollable list of saved routes for the current user."""
-        try:
-            self._ensure_saved_routes_table()
-            conn = connect_db()
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT source, destination, route_text, saved_at
-                FROM saved_routes
-                WHERE username=%s
-                ORDER BY saved_at DESC
-            """, (self.current_user,))
-            rows = cur.fetchall()
-            conn.close()
-
-            win = tk.Toplevel(self.root)
-            win.title("📋 Saved Routes")
-            win.geometry("540x420")
-            win.configure(bg="#121212")
-
-            tk.Label(win, text=f"Saved Routes for {self.current_user}",
-                     fg="#00ffcc", bg="#121212", font=("Segoe UI", 12, "bold")).pack(pady=10)
-
-            # Scrollable area
-            container = tk.Frame(win, bg="#121212")
-            container.pack(fill="both", expand=True)
-
-            list_canvas = tk.Canvas(container, bg="#121212", highlightthickness=0)
-            ybar = ttk.Scrollbar(container, orient="vertical", command=list_canvas.yview)
-            list_canvas.configure(yscrollcommand=ybar.set)
-
-            ybar.pack(side="right", fill="y")
-            list_canvas.pack(side="left", fill="both", expand=True)
-
-            list_frame = tk.Frame(list_canvas, bg="#121212")
-            list_canvas.create_window((0, 0), window=list_frame, anchor="nw")
-
-            def _on_config(_):
-                list_canvas.configure(scrollregion=list_canvas.bbox("all"))
-            list_frame.bind("<Configure>", _on_config)
-
-            if not rows:
-                tk.Label(list_frame, text="No routes saved yet!",
-                         fg="white", bg="#121212", font=("Arial", 10)).pack(pady=20)
-            else:
-                for idx, (src, dst, path, when) in enumerate(rows, 1):
-                    tk.Label(
-                        list_frame,
-                        text=f"{idx}. {src} → {dst}\n🕓 {when}\nPath: {path}",
-                        fg="white", bg="#1f1f1f",
-                        anchor="w", justify="left",
-                        font=("Consolas", 9), padx=10, pady=6
-                    ).pack(fill="x", pady=4, padx=6)
+        user = self.current_user
+
+        def first_page():
+            try:
+                self.routes.flush()  # show routes saved moments ago too
+            except driver().Error:
+                pass  # still spooled; the page query reports the outage if there is one
+            return self.db.saved_routes_page(user)
+
+        self.tasks.submit("routes-view", first_page,
+                          on_done=lambda rows: self._show_saved_routes(user, rows),
+                          on_error=self._show_error)
+
+    def _show_saved_routes(self, user: str, rows):
+        win = tk.Toplevel(self.root)
+        win.title("📋 Saved Routes")
+        win.geometry("540x420")
+        win.configure(bg="#121212")
+
+        tk.Label(win, text=f"Saved Routes for {user}",
+                 fg="#00ffcc", bg="#121212", font=("Segoe UI", 12, "bold")).pack(pady=10)
+
+        if not rows:
+            tk.Label(win, text="No routes saved yet!",
+                     fg="white", bg="#121212", font=("Arial", 10)).pack(pady=20)
+            return
 
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        def render(idx, row):
+            _, src, dst, path, when = row
+            return f"{idx + 1}. {src} → {dst}\n🕓 {when}\nPath: {path}"
+
+        def add_page(page):
+            if len(page) < SAVED_ROUTES_PAGE:
+                routes.finish()
+            routes.extend(page)
+
+        def load_more():
+            # keyset: continue after the (saved_at, id) of the last row loaded
+            last_id, *_, when = routes.items[-1]
+            self.tasks.submit(f"routes-page-{id(routes)}", self.db.saved_routes_page, user, (when, last_id),
+                              on_done=add_page, on_error=self._show_error)
+
+        # Scrollable area (virtualized: widgets only for visible rows, pages fetched on demand)
+        routes = VirtualList(win, render=render, load_more=load_more)
+        routes.pack(fill="both", expand=True)
+        add_page(rows)
+
+
+    # Stats
+
+    def _stats_text(self):
+        cache = self.spt_cache.stats()
+        return (f"{metrics.REGISTRY.format()}\n\n"
+                f"SPT cache: {cache['size']}/{cache['maxsize']} trees, hit rate {cache['hit_rate']:.0%}, "
+                f"{cache['repairs']} repairs, {cache['evictions']} evictions\n"
+                f"MST: {self.mst.updates} incremental updates, {self.mst.rebuilds} rebuilds"
+                + ("" if metrics.ENABLED else "\n\n(metrics are off: set METRICS_ENABLED in main.py)"))
+
+    def _on_view_stats(self):
+        """Timings and search counters (p50/p90/p99 from the metrics registry)."""
+        win = tk.Toplevel(self.root)
+        win.title("📊 Stats")
+        win.geometry("860x420")
+        text = tk.Text(win, font=("Courier", 9), wrap="none")
+
+        def refresh():
+            text.config(state="normal")
+            text.delete("1.0", "end")
+            text.insert("1.0", self._stats_text())
+            text.config(state="disabled")
+
+        def reset():
+            metrics.REGISTRY.reset()
+            refresh()
+
+        def save():
+            path = filedialog.asksaveasfilename(parent=win, defaultextension=".json",
+                                                filetypes=[("JSON", "*.json")])
+            if path:
+                metrics.REGISTRY.dump(path)
+
+        buttons = tk.Frame(win)
+        buttons.pack(fill="x", pady=4)
+        for label, command in (("Refresh", refresh), ("Reset", reset), ("Save JSON…", save)):
+            tk.Button(buttons, text=label, command=command, width=12).pack(side="left", padx=6)
+        text.pack(fill="both", expand=True, padx=6, pady=(0, 6))
+        refresh()
 
 
 # Run
 
 if __name__ == "__main__":
+    # imported here, not at the top: GraphPool's spawned workers re-run this module's
+    # top level, and must not each re-read the map
+    from campus_data import CAMPUS, MAP_FILE
+    if CAMPUS.xs is None:
+        sys.exit(f"{MAP_FILE}: the map has no node coordinates, so it can't be drawn. "
+                 "Add \"pos\" to a JSON map, or set CAMPUS_MAP_NODES to a nodes.csv (name,x,y) "
+                 "for a CSV edge list.")
+    metrics.enable(METRICS_ENABLED)
+    db = Database()  # pooled data access (credentials in db.DB_CONFIG)
+    try:
+        db.ensure_schema()
+    except driver().Error as e:
+        print(f"Database not ready ({e}); schema setup will be retried on first use.")
     root = tk.Tk()
-    app = CampusNavigatorApp(root)
+    app = CampusNavigatorApp(root, CAMPUS, db)
     root.mainloop()
+    app.tasks.shutdown()
+    app.pool.close()
+    app.routes.close()
+    db.close()
 
@@ -0,0 +1,154 @@
+from contextlib import contextmanager, nullcontext
+import json
+import math
+import threading
+import time
+
+
+# Metrics
+#
+# Histograms keyed by dotted names, e.g. "a_star.seconds", "a_star.settled",
+# "db.query.seconds". Recording is off until enable() is called; while off,
+# instrumented code pays one module-attribute check per call (no timing, no locking).
+
+ENABLED = False
+
+
+def enable(on: bool = True):
+    global ENABLED
+    ENABLED = on
+
+
+class Histogram:
+    """
+    Streaming distribution with power-of-two buckets: O(1) per value and a
+    fixed, small footprint. Quantiles are bucket upper bounds (within 2x).
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = {}   # exponent e -> count of values in [2**(e-1), 2**e); None for 0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        e = math.frexp(value)[1] if value > 0 else None
+        self.buckets[e] = self.buckets.get(e, 0) + 1
+
+    def quantile(self, q: float):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = self.buckets.get(None, 0)
+        if seen >= rank:
+            return 0.0
+        for e in sorted(k for k in self.buckets if k is not None):
+            seen += self.buckets[e]
+            if seen >= rank:
+                return min(math.ldexp(1.0, e), self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {"count": self.count, "sum": self.total, "mean": self.total / self.count,
+                "min": self.min, "max": self.max, "p50": self.quantile(0.5),
+                "p90": self.quantile(0.9), "p99": self.quantile(0.99)}
+
+
+class Registry:
+    """
+    Named histograms, safe to update from worker threads.
+    Usage:
+        REGISTRY.observe("db.query.seconds", 0.004)
+        REGISTRY.snapshot()          # {name: {count, mean, p50, ...}}
+    """
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            h = self._histograms.get(name)
+            if h is None:
+                h = self._histograms[name] = Histogram()
+            h.add(value)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        with self._lock:
+            return {name: h.summary() for name, h in sorted(self._histograms.items())}
+
+    def dump(self, path: str):
+        """Write the snapshot as JSON (machine-readable)."""
+        data = {"started": self.started, "time": time.time(), "metrics": self.snapshot()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def format(self):
+        """Plain-text table of the snapshot for display."""
+        rows = [f"{'metric':34s} {'count':>7s} {'mean':>10s} {'p50':>10s} {'p90':>10s} {'p99':>10s} {'max':>10s}"]
+        for name, s in self.snapshot().items():
+            if not s["count"]:
+                continue
+            scale, unit = (1000, "ms") if name.endswith(".seconds") else (1, "")
+            label = name[:-len(".seconds")] + " (ms)" if unit else name
+            rows.append(f"{label:34s} {s['count']:7d} " + " ".join(
+                f"{s[k] * scale:10.3g}" for k in ("mean", "p50", "p90", "p99", "max")))
+        return "\n".join(rows)
+
+
+REGISTRY = Registry()
+
+
+def observe(name: str, value: float):
+    if ENABLED:
+        REGISTRY.observe(name, value)
+
+
+def start():
+    """Timestamp for elapsed(); 0 while disabled, so callers need no branch."""
+    return time.perf_counter() if ENABLED else 0.0
+
+
+def elapsed(name: str, t0: float):
+    """Record perf_counter() - t0 under name + ".seconds"."""
+    if ENABLED:
+        REGISTRY.observe(name + ".seconds", time.perf_counter() - t0)
+
+
+@contextmanager
+def _timing(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.observe(name + ".seconds", time.perf_counter() - t0)
+
+
+def timer(name: str):
+    """with timer("draw"): ...  - records draw.seconds when enabled."""
+    return _timing(name) if ENABLED else nullcontext()
+
+
+def search(name: str, t0: float, settled: int, stale: int, pushes: int, scanned: int):
+    """Counters of one priority-queue search (see a_star / dijkstra_ids)."""
+    if ENABLED:
+        r = REGISTRY
+        r.observe(name + ".seconds", time.perf_counter() - t0)
+        r.observe(name + ".settled", settled)
+        r.observe(name + ".pops", settled + stale)
+        r.observe(name + ".stale", stale)
+        r.observe(name + ".pushes", pushes)
+        r.observe(name + ".edges_scanned", scanned)
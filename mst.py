@@ -0,0 +1,147 @@
+import threading
+
+from campus_graph import CLOSED, CampusGraph, kruskal_ids
+
+
+# Incremental Minimum Spanning Tree
+
+class IncrementalMST:
+    """
+    Minimum spanning forest of a CampusGraph, computed once (Kruskal) and then
+    kept up to date as paths are closed, reopened or re-weighted.
+    Usage:
+        mst = IncrementalMST(CAMPUS)
+        edges, total = mst.result()     # same shape as kruskal_mst()
+        CAMPUS.close_edge("Library", "Admin")
+        edges, total = mst.result()     # patched, not recomputed
+    Edits are picked up from the graph's change log on the next result();
+    closing a path is an edge delete, reopening one an insert. If the log no
+    longer reaches back far enough the forest is rebuilt.
+    Safe to share between worker threads.
+    """
+    def __init__(self, g: CampusGraph):
+        self.graph = g
+        self._lock = threading.Lock()
+        self.updates = self.rebuilds = 0
+        self._build()
+
+    def _build(self):
+        g = self.graph
+        self.version = g.version
+        self._tree = [{} for _ in range(len(g))]   # node id -> {neighbour id: weight}
+        for u, v, w in kruskal_ids(g):
+            self._link(u, v, w)
+        self._result = None
+
+    def _link(self, u: int, v: int, w: float):
+        self._tree[u][v] = self._tree[v][u] = w
+
+    def _cut(self, u: int, v: int):
+        del self._tree[u][v], self._tree[v][u]
+
+    def _tree_path(self, u: int, v: int):
+        """Tree path u -> v as node ids, or None if they are in different trees."""
+        tree, prev = self._tree, {u: -1}
+        stack = [u]
+        while stack:
+            x = stack.pop()
+            if x == v:
+                path = [v]
+                while prev[path[-1]] != -1:
+                    path.append(prev[path[-1]])
+                return path
+            for y in tree[x]:
+                if y not in prev:
+                    prev[y] = x
+                    stack.append(y)
+        return None
+
+    def _side(self, u: int):
+        """Node ids in u's tree."""
+        tree, seen = self._tree, {u}
+        stack = [u]
+        while stack:
+            for y in tree[stack.pop()]:
+                if y not in seen:
+                    seen.add(y)
+                    stack.append(y)
+        return seen
+
+    def _update(self, u: int, v: int, old: float, new: float, weight_of):
+        """
+        One edge changed from old to new (CLOSED = absent); the forest was
+        minimum before, and is again after. weight_of(k, a, b) gives the current
+        weight of adjacency slot k (a -> b).
+        """
+        tree = self._tree
+        if v in tree[u]:
+            if new <= old:
+                tree[u][v] = tree[v][u] = new
+                return
+            # heavier (or deleted) tree edge: cut it, then reconnect with the
+            # lightest edge across the cut, which may be this edge again
+            self._cut(u, v)
+            side = self._side(u)
+            g = self.graph
+            offsets, neighbors = g.offsets, g.neighbors
+            best, best_edge = CLOSED, None
+            for a in side:
+                for k in range(offsets[a], offsets[a + 1]):
+                    b = neighbors[k]
+                    if b not in side:
+                        w = weight_of(k, a, b)
+                        if w < best:
+                            best, best_edge = w, (a, b)
+            if best_edge is not None:
+                self._link(*best_edge, best)
+            return
+        if new >= old or new == CLOSED:
+            return  # a non-tree edge getting heavier never enters the tree
+        path = self._tree_path(u, v)
+        if path is None:
+            self._link(u, v, new)  # joins two trees of the forest
+            return
+        # lighter non-tree edge: swap out the heaviest edge on the cycle it closes
+        heaviest, cut = max((tree[a][b], (a, b)) for a, b in zip(path, path[1:]))
+        if heaviest > new:
+            self._cut(*cut)
+            self._link(u, v, new)
+
+    def _sync(self):
+        g = self.graph
+        if self.version == g.version:
+            return
+        version = g.version
+        edits = g.changes_since(self.version)
+        if edits is None:
+            self.rebuilds += 1
+            self._build()
+            return
+        pending = {}
+        for u, v, old in edits:
+            pending.setdefault((min(u, v), max(u, v)), old)
+        weights = g.weights
+
+        def weight_of(k, a, b):
+            # edges not applied yet still count with their old weight
+            return pending.get((a, b) if a < b else (b, a), weights[k])
+
+        for (u, v), old in list(pending.items()):
+            new = g.weight(g.names[u], g.names[v])
+            del pending[(u, v)]
+            if new != old:
+                self._update(u, v, old, new, weight_of)
+                self.updates += 1
+        self.version = version
+        self._result = None
+
+    def result(self):
+        """(mst_edges: list[(u, v, w)] lightest first, total_weight), like kruskal_mst()."""
+        with self._lock:
+            self._sync()
+            if self._result is None:
+                names = self.graph.names
+                edges = sorted(((u, v, w) for u, adj in enumerate(self._tree)
+                                for v, w in adj.items() if u < v), key=lambda e: e[2])
+                self._result = ([(names[u], names[v], w) for u, v, w in edges], sum(e[2] for e in edges))
+            return self._result
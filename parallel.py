@@ -0,0 +1,292 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from multiprocessing import shared_memory, util
+import os
+
+from campus_graph import CampusGraph, as_campus_graph, dijkstra_ids, first_hops, numpy_required
+
+
+# Parallel Bulk Computation
+#
+# The graph's CSR arrays are copied once into a shared-memory block that every
+# worker process maps (nothing graph-sized is pickled per task). Workers get
+# chunks of source nodes, run one Dijkstra per source and write their rows
+# straight into a shared output matrix, so results are not pickled back either.
+#
+# Shared graph layout (native byte order, sections 8-byte aligned):
+#   offsets int64[n + 1] | weights float64[m] | neighbors int32[m]
+
+# Below this many nodes process start-up costs more than it saves; work runs in-process
+PARALLEL_MIN_NODES = 500
+
+# Source chunks per worker (more = better balance when rows differ in cost)
+CHUNKS_PER_WORKER = 4
+
+
+def _section_sizes(n: int, m: int):
+    return 8 * (n + 1), 8 * m, 4 * m
+
+
+class SharedGraph:
+    """
+    Snapshot of a CampusGraph's adjacency in shared memory.
+    Usage:
+        shared = SharedGraph(CAMPUS)
+        ref = shared.ref                  # small, picklable; attach() it in a worker
+        shared.close()                    # when no more tasks will use it
+    Weight edits made to the graph afterwards are not seen (see version).
+    """
+    def __init__(self, g: CampusGraph):
+        n, m = len(g), g.num_edges
+        sizes = _section_sizes(n, m)
+        self.version = g.version
+        self._shm = shared_memory.SharedMemory(create=True, size=max(sum(sizes), 1))
+        pos = 0
+        for buf, size in zip((g.offsets, g.weights, g.neighbors), sizes):
+            self._shm.buf[pos:pos + size] = memoryview(buf).cast('B')
+            pos += size
+        self.ref = (self._shm.name, n, m)
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+class _Attached:
+    """A worker's mapping of a SharedGraph, as a CampusGraph over the shared buffers."""
+    def __init__(self, ref):
+        name, n, m = ref
+        self.shm = shared_memory.SharedMemory(name=name)
+        buf = self.shm.buf
+        a, b, c = _section_sizes(n, m)
+        self.views = [buf[:a].cast('q'), buf[a:a + b].cast('d'), buf[a + b:a + b + c].cast('i')]
+        offsets, weights, neighbors = self.views
+        # names are not needed by id-level searches; the parent maps ids back to names
+        self.graph = CampusGraph(range(n), offsets, neighbors, weights, index={})
+
+    def close(self):
+        for view in self.views:
+            view.release()
+        self.shm.close()
+
+
+_attached = {}   # shared-memory name -> _Attached, in this worker process
+_finalizer = None
+
+
+def _detach_all():
+    for hit in _attached.values():
+        hit.close()
+    _attached.clear()
+
+
+def _graph(ref):
+    global _finalizer
+    hit = _attached.get(ref[0])
+    if hit is None:
+        if _finalizer is None:
+            # unmap before the worker exits (SharedMemory can't close while views exist)
+            _finalizer = util.Finalize(None, _detach_all, exitpriority=10)
+        _detach_all()  # a newer snapshot replaces the old one
+        hit = _attached[ref[0]] = _Attached(ref)
+    return hit.graph
+
+
+def _output(name: str, typecode: str):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, shm.buf.cast(typecode)
+
+
+def _fill_rows(g: CampusGraph, rows, cols, dist_out, hop_out=None, row_stride=None, col_stride=1):
+    """
+    For each (i, source) in rows, write the distances to cols into row i of
+    dist_out (element i * row_stride + j * col_stride), and with hop_out the
+    first hop of each of those paths. cols=None means every node, in id order.
+    """
+    n = len(g)
+    width = n if cols is None else len(cols)
+    row_stride = width if row_stride is None else row_stride
+    for i, s in rows:
+        dist, parent = dijkstra_ids(g, s, cols)
+        base = i * row_stride
+        if cols is None:
+            dist_out[base:base + n] = array('d', dist)
+            if hop_out is not None:
+                hop_out[base:base + n] = array('i', first_hops(dist, parent, s))
+        elif col_stride == 1:
+            dist_out[base:base + width] = array('d', [dist[c] for c in cols])
+        else:
+            for j, c in enumerate(cols):
+                dist_out[base + j * col_stride] = dist[c]
+
+
+def _rows_task(graph_ref, dist_name: str, hop_name, rows, cols, row_stride, col_stride):
+    """Worker: _fill_rows() into the shared output matrices."""
+    g = _graph(graph_ref)
+    dist_shm, dist_out = _output(dist_name, 'd')
+    hop_shm = hop_out = None
+    if hop_name is not None:
+        hop_shm, hop_out = _output(hop_name, 'i')
+    try:
+        _fill_rows(g, rows, cols, dist_out, hop_out, row_stride, col_stride)
+    finally:
+        dist_out.release()
+        dist_shm.close()
+        if hop_shm is not None:
+            hop_out.release()
+            hop_shm.close()
+    return len(rows)
+
+
+def _find_routes(g: CampusGraph, groups):
+    """[(request index, path ids or None, cost)] for [(source, [(index, target)])] groups."""
+    out = []
+    for s, wanted in groups:
+        dist, parent = dijkstra_ids(g, s, [t for _, t in wanted])
+        for i, t in wanted:
+            if dist[t] == float('inf'):
+                out.append((i, None, dist[t]))
+                continue
+            path = [t]
+            while path[-1] != s:
+                path.append(parent[path[-1]])
+            path.reverse()
+            out.append((i, path, dist[t]))
+    return out
+
+
+def _routes_task(graph_ref, groups):
+    """Worker: _find_routes() on the shared graph."""
+    return _find_routes(_graph(graph_ref), groups)
+
+
+class GraphPool:
+    """
+    Process pool for bulk shortest-path work on one graph.
+    Usage:
+        with GraphPool(CAMPUS, workers=4) as pool:
+            dist, next_hop = pool.all_pairs()             # flat n*n arrays, as RouteTable stores them
+            m = pool.distance_matrix(sources, targets)    # like campus_graph.distance_matrix()
+            results = pool.routes([("Front Gate", "Library"), ...])   # [(path, cost)]
+    The graph goes into shared memory once per version: after a path is closed
+    or re-weighted (or update_graph() swaps in another graph, e.g. a snapshot()),
+    the next call publishes a fresh copy; the worker processes stay. Small graphs
+    (PARALLEL_MIN_NODES) and workers <= 1 run in-process with the same results.
+    """
+    def __init__(self, graph, workers: int = None):
+        self.graph = as_campus_graph(graph)
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._pool = None
+        self._shared = None
+
+    def update_graph(self, graph):
+        """Run later calls on graph, keeping the worker processes."""
+        graph = as_campus_graph(graph)
+        if graph is not self.graph and self._shared is not None:
+            self._shared.close()
+            self._shared = None
+        self.graph = graph
+
+    @property
+    def parallel(self):
+        return self.workers > 1 and len(self.graph) >= PARALLEL_MIN_NODES
+
+    def _ref(self):
+        if self._shared is not None and self._shared.version != self.graph.version:
+            self._shared.close()  # workers still mapping it keep their copy until they move on
+            self._shared = None
+        if self._shared is None:
+            self._shared = SharedGraph(self.graph)
+        if self._pool is None:
+            # spawn: forking a process that runs Tk or worker threads is unsafe
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._shared.ref
+
+    def _chunks(self, items):
+        size = max(1, -(-len(items) // (self.workers * CHUNKS_PER_WORKER)))
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    def _rows(self, rows, cols, size: int, hops: bool = False, row_stride=None, col_stride=1):
+        """Run _fill_rows over rows (in parallel when worthwhile); returns (dist, next_hop or None) arrays."""
+        if not self.parallel:
+            dist = array('d', bytes(8 * size))
+            hop = array('i', bytes(4 * size)) if hops else None
+            _fill_rows(self.graph, rows, cols, dist, hop, row_stride, col_stride)
+            return dist, hop
+        ref = self._ref()
+        outs = [shared_memory.SharedMemory(create=True, size=max(8 * size, 1))]
+        if hops:
+            outs.append(shared_memory.SharedMemory(create=True, size=max(4 * size, 1)))
+        try:
+            hop_name = outs[1].name if hops else None
+            futures = [self._pool.submit(_rows_task, ref, outs[0].name, hop_name, chunk, cols,
+                                         row_stride, col_stride)
+                       for chunk in self._chunks(rows)]
+            for f in futures:
+                f.result()
+            dist = array('d')
+            dist.frombytes(outs[0].buf[:8 * size])
+            hop = None
+            if hops:
+                hop = array('i')
+                hop.frombytes(outs[1].buf[:4 * size])
+            return dist, hop
+        finally:
+            for shm in outs:
+                shm.close()
+                shm.unlink()
+
+    def all_pairs(self):
+        """(dist float64[n*n], next_hop int32[n*n]) with row = source, as RouteTable.build() makes them."""
+        n = len(self.graph)
+        return self._rows(list(enumerate(range(n))), None, n * n, hops=True)
+
+    def distance_matrix(self, sources, targets):
+        """Same result as campus_graph.distance_matrix(), with rows spread over the workers."""
+        np = numpy_required("GraphPool.distance_matrix()")
+        g = self.graph
+        src = [g.index[s] for s in sources]
+        dst = [g.index[t] for t in targets]
+        flip = len(dst) < len(src) and g.symmetric  # search from the smaller side when that gives the same answer
+        rows, cols = (dst, src) if flip else (src, dst)
+        row_stride, col_stride = (1, len(dst)) if flip else (len(dst), 1)
+        out, _ = self._rows(list(enumerate(rows)), cols, len(src) * len(dst),
+                            row_stride=row_stride, col_stride=col_stride)
+        return np.frombuffer(out, dtype=np.float64).reshape(len(src), len(dst))
+
+    def routes(self, pairs):
+        """[(path or None, cost)] for many (start, goal) pairs; one search per distinct start."""
+        g = self.graph
+        by_source = {}
+        for i, (start, goal) in enumerate(pairs):
+            by_source.setdefault(g.index[start], []).append((i, g.index[goal]))
+        groups = list(by_source.items())
+        if self.parallel:
+            ref = self._ref()
+            futures = [self._pool.submit(_routes_task, ref, chunk) for chunk in self._chunks(groups)]
+            found = [r for f in futures for r in f.result()]
+        else:
+            found = _find_routes(g, groups)
+        results = [None] * len(pairs)
+        names = g.names
+        for i, path, cost in found:
+            results[i] = ([names[u] for u in path] if path is not None else None, cost)
+        return results
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
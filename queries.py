@@ -0,0 +1,92 @@
+import math
+
+from campus_graph import CampusGraph, a_star, dijkstra_ids
+from mst import IncrementalMST
+from spatial import SpatialIndex
+
+
+# Graph Queries
+#
+# JSON-ready answers shared by the HTTP service (server.py) and the JSONL
+# command line (cli.py). They take and return plain values, so they run the
+# same in a pool worker. The graph (and its MST / spatial index, built on
+# first use) is set once per process with set_graph().
+_GRAPH = None
+_MST = None
+_SPATIAL = None
+
+
+def set_graph(graph: CampusGraph):
+    """Graph the query functions below answer for (once per process)."""
+    global _GRAPH, _MST, _SPATIAL
+    _GRAPH = graph
+    _MST = _SPATIAL = None
+
+
+class QueryError(ValueError):
+    """A query field is missing or invalid (HTTP 400 / an error line in the CLI)."""
+
+
+def node_param(graph: CampusGraph, params: dict, field: str):
+    """A location name that exists in graph."""
+    name = params.get(field)
+    if not name or not isinstance(name, str):
+        raise QueryError(f"missing '{field}'")
+    if name not in graph:
+        raise QueryError(f"unknown location '{name}'")
+    return name
+
+
+def number_param(params: dict, field: str, minimum: float = None):
+    """
+    A finite number: JSON int / float (not true / false) or numeric text, as in
+    a query string. With minimum, smaller values are refused too.
+    """
+    value = params.get(field)
+    try:
+        if isinstance(value, str):
+            value = float(value)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError
+    except (ValueError, OverflowError):  # OverflowError: an int too big for a float
+        raise QueryError(f"'{field}' must be a number") from None
+    if minimum is not None and value < minimum:
+        raise QueryError(f"'{field}' must be a number >= {minimum:g}")
+    return value
+
+
+def _finite(x):
+    return None if x == float('inf') else x
+
+
+def route_query(start: str, goal: str):
+    path, cost = a_star(_GRAPH, start, goal)
+    return {"path": path, "cost": _finite(cost)}
+
+
+def reachable_query(start: str, budget: float):
+    g = _GRAPH
+    dist, parent = dijkstra_ids(g, g.index[start])
+    names = g.names
+    order = sorted((v for v in range(len(g)) if dist[v] <= budget), key=dist.__getitem__)
+    return {"reachable": [{"node": names[v], "dist": dist[v]} for v in order],
+            "edges": [[names[parent[v]], names[v]] for v in order if parent[v] != -1]}
+
+
+def mst_query():
+    global _MST
+    if _MST is None:
+        _MST = IncrementalMST(_GRAPH)
+    mst, total = _MST.result()
+    return {"edges": [list(e) for e in mst], "total": total}
+
+
+def nearest_query(x: float, y: float):
+    global _SPATIAL
+    if _SPATIAL is None:
+        _SPATIAL = SpatialIndex(_GRAPH)
+    u = _SPATIAL.nearest(x, y)
+    if u == -1:
+        return {"node": None, "distance": None}
+    g = _GRAPH
+    return {"node": g.names[u], "distance": math.hypot(g.xs[u] - x, g.ys[u] - y)}
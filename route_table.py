@@ -0,0 +1,147 @@
+from array import array
+import mmap
+import os
+import struct
+import tempfile
+
+from campus_graph import CampusGraph, as_campus_graph, dijkstra_ids, first_hops
+from parallel import GraphPool
+
+
+# All-Pairs Route Table
+#
+# File layout (native byte order, 64-byte header keeps the matrices aligned):
+#   magic b"CNRT" | version u32 | n u64 | sha256 digest (32 bytes) | padding
+#   dist     float64[n * n]   row = source, column = target (inf if unreachable)
+#   next_hop int32[n * n]     first node after source on the path (-1 if none)
+
+MAGIC = b"CNRT"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("=4sIQ32s")
+HEADER_SIZE = 64
+
+# Above this the n*n matrices get too big; callers fall back to a_star()
+MAX_TABLE_NODES = 4000
+
+
+class RouteTable:
+    """
+    Precomputed distance + next-hop matrices for every pair of nodes.
+    Usage:
+        table = RouteTable.load_or_build(CAMPUS, "cache/campus_routes.bin")
+        path, cost = table.path("Front Gate", "Back Gate")
+    Lookups do no heap work; path reconstruction is O(path length).
+    """
+    def __init__(self, g: CampusGraph, dist, next_hop, digest: str, mm=None):
+        self.graph = g
+        self.n = len(g)
+        self.dist = dist            # flat float64 buffer (array or memoryview)
+        self.next_hop = next_hop    # flat int32 buffer
+        self.digest = digest
+        self._mm = mm
+
+    @classmethod
+    def build(cls, graph, workers: int = 0, pool: GraphPool = None):
+        """
+        Run a shortest-path tree from every node and fill both matrices.
+        workers > 1 spreads the sources over that many processes (parallel.GraphPool);
+        pass a long-lived pool instead to reuse its processes across rebuilds.
+        """
+        g = as_campus_graph(graph)
+        digest = g.digest()  # of the weights the build starts from (pass a snapshot() if edits can race)
+        if pool is not None:
+            pool.update_graph(g)
+            dist, next_hop = pool.all_pairs()
+            return cls(g, dist, next_hop, digest)
+        if workers > 1:
+            with GraphPool(g, workers) as pool:
+                dist, next_hop = pool.all_pairs()
+            return cls(g, dist, next_hop, digest)
+        dist = array('d')
+        next_hop = array('i')
+        for s in range(len(g)):
+            d, parent = dijkstra_ids(g, s)
+            dist.extend(d)
+            next_hop.extend(first_hops(d, parent, s))
+        return cls(g, dist, next_hop, digest)
+
+    @classmethod
+    def load(cls, graph, path: str):
+        """Memory-map a table file; returns None if it is missing, stale or corrupt."""
+        g = as_campus_graph(graph)
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return None
+        with f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                return None
+        if len(mm) < HEADER_SIZE:
+            mm.close()
+            return None
+        magic, version, n, digest = _HEADER.unpack_from(mm, 0)
+        expected = HEADER_SIZE + n * n * 12
+        if (magic != MAGIC or version != FORMAT_VERSION or n != len(g)
+                or digest.hex() != g.digest() or len(mm) != expected):
+            mm.close()
+            return None
+        view = memoryview(mm)
+        dist_end = HEADER_SIZE + n * n * 8
+        dist = view[HEADER_SIZE:dist_end].cast('d')
+        next_hop = view[dist_end:expected].cast('i')
+        return cls(g, dist, next_hop, digest.hex(), mm)
+
+    def save(self, path: str):
+        """Write atomically (temp file + rename) so readers never see a partial table."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, self.n, bytes.fromhex(self.digest))
+        # unique temp name: two background rebuilds may save at the same time
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path) or ".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header.ljust(HEADER_SIZE, b"\0"))
+                f.write(bytes(self.dist))
+                f.write(bytes(self.next_hop))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load_or_build(cls, graph, path: str, workers: int = 0, pool: GraphPool = None):
+        """Use the cached file when its graph digest matches, else rebuild and rewrite it."""
+        g = as_campus_graph(graph)
+        table = cls.load(g, path)
+        if table is None:
+            table = cls.build(g, workers, pool)
+            table.save(path)
+            table = cls.load(g, path) or table
+        return table
+
+    def close(self):
+        if self._mm is not None:
+            self.dist.release()
+            self.next_hop.release()
+            self._mm.close()
+            self._mm = None
+
+    def distance(self, start: str, goal: str):
+        g = self.graph
+        return self.dist[g.index[start] * self.n + g.index[goal]]
+
+    def path(self, start: str, goal: str):
+        """Returns (path_nodes_list or None, total_cost), same as a_star()."""
+        g = self.graph
+        s, t = g.index[start], g.index[goal]
+        n, next_hop = self.n, self.next_hop
+        if s == t:
+            return [start], 0
+        if next_hop[s * n + t] == -1:
+            return None, float('inf')
+        path, cur = [s], s
+        while cur != t:
+            cur = next_hop[cur * n + t]
+            path.append(cur)
+        return [g.names[i] for i in path], self.dist[s * n + t]
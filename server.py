@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import json
+import multiprocessing
+from urllib.parse import parse_qsl, urlsplit
+
+from campus_graph import CampusGraph
+import metrics
+from queries import (QueryError, mst_query, nearest_query, node_param, number_param, reachable_query,
+                     route_query, set_graph)
+
+
+# Headless Routing Service
+#
+#   GET  /health
+#   GET  /route?from=Library&to=Lab          -> {"path": [...], "cost": 7}
+#   GET  /reachable?from=Library&budget=8    -> {"reachable": [{"node", "dist"}], "edges": [[parent, node]]}
+#   GET  /mst                                -> {"edges": [[u, v, w]], "total": 34}
+#   GET  /nearest?x=410&y=180                -> {"node": "Lab", "distance": 10.0}  (map coordinates)
+#   GET  /metrics                            -> {"metrics": {name: {count, mean, p50, p90, p99, ...}}}
+#        (with --metrics; search counters only cover queries run in this process, i.e. --workers 0)
+# POST with a JSON object body works too (same field names).
+
+MAX_BODY = 64 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RoutingServer:
+    """
+    asyncio HTTP/JSON front end for the graph algorithms.
+    Usage:
+        server = RoutingServer(CAMPUS, workers=2)
+        asyncio.run(server.serve("0.0.0.0", 8080))
+    The graph is loaded once (and once per worker process). Queries run in
+    a process pool (workers > 0) or a thread pool, and identical requests that
+    arrive while one is already being computed share its result.
+    """
+    def __init__(self, graph: CampusGraph, workers: int = 0):
+        self.graph = graph
+        set_graph(graph)
+        if workers > 0:
+            # spawn, not fork: forked workers would inherit (and hold open) client sockets
+            self.pool = ProcessPoolExecutor(max_workers=workers, initializer=set_graph, initargs=(graph,),
+                                            mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="campus-query")
+        self._inflight = {}
+        self.coalesced = 0
+
+    async def _run(self, key: tuple, fn, *args):
+        """Run fn(*args) in the pool, coalescing identical in-flight requests."""
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.coalesced += 1
+            return await asyncio.shield(fut)
+        fut = asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+        self._inflight[key] = fut
+        try:
+            return await asyncio.shield(fut)
+        finally:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    async def dispatch(self, path: str, params: dict):
+        try:
+            return await self._dispatch(path, params)
+        except QueryError as e:
+            raise HTTPError(400, str(e)) from None
+
+    async def _dispatch(self, path: str, params: dict):
+        if path == "/health":
+            return {"status": "ok", "nodes": len(self.graph), "coalesced": self.coalesced}
+        if path == "/metrics":
+            return {"enabled": metrics.ENABLED, "metrics": metrics.REGISTRY.snapshot()}
+        if path == "/route":
+            start, goal = node_param(self.graph, params, "from"), node_param(self.graph, params, "to")
+            return await self._run(("route", start, goal), route_query, start, goal)
+        if path == "/reachable":
+            start = node_param(self.graph, params, "from")
+            budget = number_param(params, "budget", minimum=0)
+            return await self._run(("reachable", start, budget), reachable_query, start, budget)
+        if path == "/mst":
+            return await self._run(("mst",), mst_query)
+        if path == "/nearest":
+            if self.graph.xs is None:
+                raise HTTPError(400, "this map has no coordinates")
+            x, y = number_param(params, "x"), number_param(params, "y")
+            return await self._run(("nearest", x, y), nearest_query, x, y)
+        raise HTTPError(404, f"no such endpoint '{path}'")
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+        headers = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = h.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            raise HTTPError(400, "Content-Length must be a non-negative integer")
+        if length > MAX_BODY:
+            raise HTTPError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def handle(self, reader, writer):
+        """One client connection (HTTP/1.1 keep-alive)."""
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    req = await self._read_request(reader)
+                    if req is None:
+                        break
+                    method, target, headers, body = req
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    url = urlsplit(target)
+                    params = dict(parse_qsl(url.query))
+                    if method == "POST":
+                        try:
+                            data = json.loads(body or b"{}")
+                        except ValueError:
+                            raise HTTPError(400, "body is not valid JSON")
+                        if not isinstance(data, dict):
+                            raise HTTPError(400, "body must be a JSON object")
+                        params.update(data)
+                    elif method != "GET":
+                        raise HTTPError(405, f"method {method} not allowed")
+                    t0 = metrics.start()
+                    status, payload = 200, await self.dispatch(url.path, params)
+                    metrics.elapsed("http" + url.path.replace("/", "."), t0)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+                data = json.dumps(payload).encode("utf-8")
+                writer.write((f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                              f"Content-Type: application/json\r\n"
+                              f"Content-Length: {len(data)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                              ).encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Campus routing service on http://{host}:{port} ({len(self.graph)} locations)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless campus routing service (HTTP/JSON).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="worker processes for queries (0 = threads in this process)")
+    parser.add_argument("--metrics", action="store_true", help="record timings and search counters (GET /metrics)")
+    args = parser.parse_args(argv)
+    metrics.enable(args.metrics)
+
+    from campus_data import CAMPUS
+    try:
+        asyncio.run(RoutingServer(CAMPUS, workers=args.workers).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
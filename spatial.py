@@ -0,0 +1,131 @@
+from array import array
+import math
+
+from campus_graph import CampusGraph
+
+
+# Spatial Index
+
+class SpatialIndex:
+    """
+    Uniform grid over node coordinates (about per_cell nodes per cell).
+    Usage:
+        idx = SpatialIndex(CAMPUS)
+        u = idx.nearest(x, y)                    # snap a click / GPS fix to a node id
+        ids = idx.query(x0, y0, x1, y1)          # nodes inside a rectangle
+        for u, v, w in idx.edges_in(x0, y0, x1, y1): ...
+    Cells are stored CSR-style (cell_start / cell_items), so lookups only
+    touch the cells around the point or rectangle, not every node.
+    """
+    def __init__(self, g: CampusGraph, per_cell: float = 2.0):
+        if g.xs is None:
+            raise ValueError("graph has no node coordinates")
+        self.graph = g
+        xs, ys = g.xs, g.ys
+        n = len(g)
+        self.x0, self.y0 = (min(xs), min(ys)) if n else (0.0, 0.0)
+        w, h = (max(xs) - self.x0, max(ys) - self.y0) if n else (0.0, 0.0)
+        self.cell = max(math.sqrt(w * h * per_cell / max(n, 1)), max(w, h) / max(n, 1), 1e-9)
+        self.cols, self.rows = int(w // self.cell) + 1, int(h // self.cell) + 1
+
+        # counting sort of node ids by cell
+        cell_of = array('i', (self._cell_id(xs[u], ys[u]) for u in range(n)))
+        start = array('q', bytes(8 * (self.cols * self.rows + 1)))
+        for c in cell_of:
+            start[c + 1] += 1
+        for c in range(self.cols * self.rows):
+            start[c + 1] += start[c]
+        items, cursor = array('i', bytes(4 * n)), start[:-1]
+        for u, c in enumerate(cell_of):
+            items[cursor[c]] = u
+            cursor[c] += 1
+        self.cell_start, self.cell_items = start, items
+
+        # Edges longer than reach can cross a rectangle with both ends far
+        # outside it; those few are always checked, the rest are found from
+        # nodes within reach of the rectangle.
+        self.reach = 4 * self.cell
+        offsets, neighbors = g.offsets, g.neighbors
+        self._long = bytearray(g.num_edges)
+        self.long_edges = []
+        for u in range(n):
+            for k in range(offsets[u], offsets[u + 1]):
+                v = neighbors[k]
+                if math.hypot(xs[u] - xs[v], ys[u] - ys[v]) > self.reach:
+                    self._long[k] = 1
+                    if u < v:
+                        self.long_edges.append((u, v, k))
+
+    def _axis(self, v, lo, count):
+        """Cell index of v along one axis, clamped to 0..count-1 before int() (huge v would overflow)."""
+        q = (v - lo) / self.cell
+        if not q > 0:  # also nan
+            return 0
+        return int(q) if q < count else count - 1
+
+    def _cell_id(self, x, y):
+        cx, cy = self._clamp(x, y)
+        return cy * self.cols + cx
+
+    def _clamp(self, x, y):
+        return self._axis(x, self.x0, self.cols), self._axis(y, self.y0, self.rows)
+
+    def _cells(self, cx0, cy0, cx1, cy1):
+        start, items = self.cell_start, self.cell_items
+        for cy in range(max(cy0, 0), min(cy1, self.rows - 1) + 1):
+            row = cy * self.cols
+            a, b = start[row + max(cx0, 0)], start[row + min(cx1, self.cols - 1) + 1]
+            yield from items[a:b]
+
+    def query(self, x0: float, y0: float, x1: float, y1: float):
+        """Ids of nodes with x0 <= x <= x1 and y0 <= y <= y1."""
+        if x1 < x0 or y1 < y0:
+            return []
+        xs, ys = self.graph.xs, self.graph.ys
+        (cx0, cy0), (cx1, cy1) = self._clamp(x0, y0), self._clamp(x1, y1)
+        return [u for u in self._cells(cx0, cy0, cx1, cy1) if x0 <= xs[u] <= x1 and y0 <= ys[u] <= y1]
+
+    def nearest(self, x: float, y: float, max_dist: float = float('inf')):
+        """Id of the node closest to (x, y), or -1 if none is within max_dist."""
+        if not len(self.cell_items):
+            return -1
+        xs, ys = self.graph.xs, self.graph.ys
+        cx, cy = self._clamp(x, y)
+        best, best_d = -1, max_dist
+        r = 0
+        while r <= max(self.cols, self.rows):
+            # cells on the ring at Chebyshev distance r from (cx, cy)
+            for gy in (cy - r, cy + r) if r else (cy,):
+                cells = self._cells(cx - r, gy, cx + r, gy) if 0 <= gy < self.rows else ()
+                for u in cells:
+                    d = math.hypot(xs[u] - x, ys[u] - y)
+                    if d < best_d or (d == best_d and best == -1):
+                        best, best_d = u, d
+            for gx in (cx - r, cx + r) if r else ():
+                if 0 <= gx < self.cols:
+                    for u in self._cells(gx, cy - r + 1, gx, cy + r - 1):
+                        d = math.hypot(xs[u] - x, ys[u] - y)
+                        if d < best_d or (d == best_d and best == -1):
+                            best, best_d = u, d
+            # every cell further out is at least r * cell away
+            if r * self.cell >= best_d:
+                break
+            r += 1
+        return best
+
+    def edges_in(self, x0: float, y0: float, x1: float, y1: float):
+        """
+        Yield (u, v, w) with u < v for every edge (closed ones included) that may
+        cross the rectangle; a superset, so callers still clip exactly.
+        """
+        g = self.graph
+        offsets, neighbors, weights, long = g.offsets, g.neighbors, g.weights, self._long
+        near = self.query(x0 - self.reach, y0 - self.reach, x1 + self.reach, y1 + self.reach)
+        inside = set(near)
+        for u in near:
+            for k in range(offsets[u], offsets[u + 1]):
+                v = neighbors[k]
+                if not long[k] and (u < v or v not in inside):
+                    yield (u, v, weights[k]) if u < v else (v, u, weights[k])
+        for u, v, k in self.long_edges:
+            yield u, v, weights[k]
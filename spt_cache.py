@@ -0,0 +1,210 @@
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+import heapq
+import threading
+
+from campus_graph import CampusGraph, dijkstra_ids
+
+
+# Shortest-Path-Tree Cache
+
+class ShortestPathTree:
+    """
+    One dijkstra_ids() result plus its reachable nodes sorted by distance,
+    so budget queries are a bisect instead of a scan.
+    """
+    def __init__(self, g: CampusGraph, source: int, dist=None, parent=None, version: int = None):
+        self.graph = g
+        self.source = source
+        self.version = g.version if version is None else version
+        if dist is None:
+            dist, parent = dijkstra_ids(g, source)
+        self.dist, self.parent = dist, parent
+        self.order = array('i', sorted((v for v in range(len(g)) if dist[v] != float('inf')),
+                                       key=dist.__getitem__))
+        self.sorted_dist = array('d', (dist[v] for v in self.order))
+
+    def within(self, budget: float):
+        """Node ids with dist <= budget, nearest first."""
+        return self.order[:bisect_right(self.sorted_dist, budget)]
+
+    def repaired(self, edits, version: int):
+        """
+        Copy of this tree brought up to date with the graph's current weights,
+        given the edits [(u, v, old_weight)] made since it was built.
+        """
+        dist, parent = list(self.dist), list(self.parent)
+        repair_spt(self.graph, dist, parent, edits)
+        return ShortestPathTree(self.graph, self.source, dist, parent, version)
+
+    def path_to(self, target: int):
+        """Id path source -> target, or None if unreachable."""
+        if self.dist[target] == float('inf'):
+            return None
+        path, cur = [target], target
+        while cur != self.source:
+            cur = self.parent[cur]
+            path.append(cur)
+        path.reverse()
+        return path
+
+
+def repair_spt(g: CampusGraph, dist: list, parent: list, edits):
+    """
+    Dynamic SSSP update, in place: (dist, parent) were exact for the weights
+    before edits [(u, v, old_weight)] and become exact for g's current weights.
+    Only the subtrees hanging off lengthened tree edges are reset, and only
+    nodes whose distance can change go back on the heap.
+    """
+    offsets, neighbors, weights = g.offsets, g.neighbors, g.weights
+    original = {}
+    for u, v, old in edits:
+        original.setdefault((min(u, v), max(u, v)), old)
+    changed = [(u, v, old, g.weight(g.names[u], g.names[v])) for (u, v), old in original.items()]
+
+    # Lengthened tree edges cut off the subtree below them
+    affected = set()
+    for u, v, old, new in changed:
+        child = v if parent[v] == u else u if parent[u] == v else -1
+        if new > old and child != -1 and child not in affected:
+            stack = [child]
+            affected.add(child)
+            while stack:
+                x = stack.pop()
+                for k in range(offsets[x], offsets[x + 1]):
+                    y = neighbors[k]
+                    if parent[y] == x and y not in affected:
+                        affected.add(y)
+                        stack.append(y)
+    for x in affected:
+        dist[x], parent[x] = float('inf'), -1
+
+    # Seeds: cut-off nodes restart from their best neighbour outside the cut,
+    # and shortened edges may offer a better way to either end
+    pq = []
+    for x in affected:
+        for k in range(offsets[x], offsets[x + 1]):
+            y = neighbors[k]
+            nd = dist[y] + weights[k]
+            if nd < dist[x]:
+                dist[x], parent[x] = nd, y
+        if dist[x] != float('inf'):
+            pq.append((dist[x], x))
+    for u, v, old, new in changed:
+        if new < old:
+            for a, b in ((u, v), (v, u)):
+                nd = dist[a] + new
+                if nd < dist[b]:
+                    dist[b], parent[b] = nd, a
+                    pq.append((nd, b))
+    heapq.heapify(pq)
+
+    while pq:
+        d, x = heapq.heappop(pq)
+        if d != dist[x]:
+            continue
+        for k in range(offsets[x], offsets[x + 1]):
+            y = neighbors[k]
+            nd = d + weights[k]
+            if nd < dist[y]:
+                dist[y], parent[y] = nd, x
+                heapq.heappush(pq, (nd, y))
+
+
+class SPTCache:
+    """
+    Bounded LRU of ShortestPathTree keyed by source node.
+    Usage:
+        cache = SPTCache(CAMPUS, maxsize=64)
+        tree = cache.tree("Library")           # computed once, then reused
+        route = cache.route("Library", "Lab")  # None unless a tree is already cached
+    After CampusGraph.set_weight() a cached tree is repaired (repair_spt) the
+    next time it is used, instead of being recomputed from scratch.
+    hits / misses / evictions / repairs are kept for sizing the cache.
+    Safe to share between worker threads (trees are built outside the lock).
+    """
+    def __init__(self, g: CampusGraph, maxsize: int = 64):
+        self.graph = g
+        self.maxsize = maxsize
+        self._trees = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.repairs = 0
+
+    def __len__(self):
+        return len(self._trees)
+
+    def _get(self, source: int):
+        with self._lock:
+            tree = self._trees.get(source)
+            if tree is not None:
+                self._trees.move_to_end(source)
+        g = self.graph
+        if tree is None or tree.version == g.version:
+            return tree
+        version = g.version
+        edits = g.changes_since(tree.version)
+        with self._lock:
+            if edits is None:  # too many edits ago: recompute on demand
+                if self._trees.get(source) is tree:
+                    del self._trees[source]
+                return None
+            self.repairs += 1
+        tree = tree.repaired(edits, version)
+        with self._lock:
+            self._trees[source] = tree
+        return tree
+
+    def tree(self, source: str):
+        """Cached tree for source, computing (and possibly evicting) on a miss."""
+        s = self.graph.index[source]
+        tree = self._get(s)
+        if tree is not None:
+            with self._lock:
+                self.hits += 1
+            return tree
+        with self._lock:
+            self.misses += 1
+        tree = ShortestPathTree(self.graph, s)
+        with self._lock:
+            self._trees[s] = tree
+            self._trees.move_to_end(s)
+            while len(self._trees) > self.maxsize:
+                self._trees.popitem(last=False)
+                self.evictions += 1
+        return tree
+
+    def route(self, start: str, goal: str):
+        """
+        (path, cost) from an already cached tree rooted at start or goal
+        (the graph is undirected, so a goal tree read backwards works too).
+        Returns None when neither tree is cached; never computes a new one.
+        """
+        g = self.graph
+        s, t = g.index[start], g.index[goal]
+        for root, other, flip in ((s, t, False), (t, s, True)):
+            tree = self._get(root)
+            if tree is None:
+                continue
+            with self._lock:
+                self.hits += 1
+            ids = tree.path_to(other)
+            if ids is None:
+                return None, float('inf')
+            if flip:
+                ids.reverse()
+            return [g.names[i] for i in ids], tree.dist[other]
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._trees.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"size": len(self._trees), "maxsize": self.maxsize, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions, "repairs": self.repairs,
+                    "hit_rate": self.hits / total if total else 0.0}
@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import sys
+
+
+# Background Tasks
+
+class TaskRunner:
+    """
+    Runs blocking work (MySQL I/O, graph computation) off the Tk event thread.
+    Usage:
+        runner = TaskRunner(root, on_busy=show_spinner)
+        runner.submit("route", find_route, start, goal, on_done=draw_route)
+    Workers never touch Tk: finished results are queued and handed to on_done /
+    on_error on the main thread by a root.after() poll that only runs while work
+    is pending. Submitting again with the same key supersedes the earlier task -
+    it is cancelled if it has not started, and its result is dropped otherwise.
+    """
+    POLL_MS = 25
+
+    def __init__(self, root, io_workers: int = 4, on_busy=None):
+        self.root = root
+        self.on_busy = on_busy
+        self._io = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="campus-io")
+        self._done = queue.Queue()
+        self._latest = {}    # key -> (generation, future) of the task whose result we still want
+        self._generation = 0
+        self._polling = False
+
+    @property
+    def busy(self):
+        return bool(self._latest)
+
+    def submit(self, key: str, fn, *args, on_done=None, on_error=None):
+        """Queue fn(*args); callbacks receive its result / exception on the Tk thread."""
+        was_busy = self.busy
+        old = self._latest.get(key)
+        if old is not None:
+            old[1].cancel()
+        self._generation += 1
+        gen = self._generation
+        fut = self._io.submit(fn, *args)
+        self._latest[key] = (gen, fut)
+        fut.add_done_callback(lambda f: self._done.put((key, gen, f, on_done, on_error)))
+        if not was_busy and self.on_busy:
+            self.on_busy(True)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._drain)
+        return fut
+
+    def cancel(self, key: str):
+        """Forget the pending task for key (its result will be ignored)."""
+        old = self._latest.pop(key, None)
+        if old is not None:
+            old[1].cancel()
+            if not self.busy and self.on_busy:
+                self.on_busy(False)
+
+    def cancel_all(self, keep=()):
+        """cancel() every pending task except those whose key is in keep."""
+        for key in list(self._latest):
+            if key not in keep:
+                self.cancel(key)
+
+    def _drain(self):
+        while True:
+            try:
+                key, gen, fut, on_done, on_error = self._done.get_nowait()
+            except queue.Empty:
+                break
+            current = self._latest.get(key)
+            if current is None or current[0] != gen or fut.cancelled():
+                continue  # superseded or cancelled
+            del self._latest[key]
+            if not self.busy and self.on_busy:
+                self.on_busy(False)
+            try:
+                exc = fut.exception()
+                if exc is None:
+                    if on_done:
+                        on_done(fut.result())
+                elif on_error:
+                    on_error(exc)
+                else:
+                    raise exc
+            except Exception:
+                # same reporting as an exception in any other Tk callback; keep draining
+                self.root.report_callback_exception(*sys.exc_info())
+        if self.busy:
+            self.root.after(self.POLL_MS, self._drain)
+        else:
+            self._polling = False
+
+    def shutdown(self):
+        self._latest.clear()
+        self._io.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,21 @@
+import random
+
+from campus_graph import CampusGraph
+
+
+def random_graph(seed: int, max_nodes: int = 8, weights=(0, 1, 2, 3, 5)):
+    """Small connected-ish undirected map with repeated and zero weights (ties on purpose)."""
+    rng = random.Random(seed)
+    n = rng.randint(2, max_nodes)
+    names = [f"N{i}" for i in range(n)]
+    us, vs, ws = [], [], []
+    for _ in range(rng.randint(n - 1, 2 * n)):
+        u, v = rng.sample(range(n), 2)
+        us.append(u)
+        vs.append(v)
+        ws.append(rng.choice(weights))
+    return CampusGraph.from_edges(names, us, vs, ws)
+
+
+def path_cost(g: CampusGraph, path):
+    return sum(g.weight(a, b) for a, b in zip(path, path[1:]))
@@ -0,0 +1,22 @@
+import io
+import json
+
+import cli
+from campus_data import CAMPUS
+
+
+def _answers(*lines):
+    out = io.StringIO()
+    cli.run(CAMPUS, [line + "\n" for line in lines], out)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_bad_lines_do_not_end_the_stream():
+    answers = _answers('{"op": "reachable", "from": "Library", "budget": ' + "9" * 400 + '}',
+                       '{"op": "nearest", "x": true, "y": 1}',
+                       'not json',
+                       '{"op": "route", "from": "Library", "to": "Lab", "id": 7}')
+    assert answers[0] == {"error": "'budget' must be a number"}
+    assert answers[1] == {"error": "'x' must be a number"}
+    assert answers[2]["error"].startswith("line 3:")
+    assert answers[3] == {"id": 7, "path": ["Library", "Lab"], "cost": 4.0}
@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from campus_data import CAMPUS
+from campus_graph import CampusGraph, a_star, distance_matrix
+
+
+def test_matches_a_star_both_shapes():
+    names = CAMPUS.names
+    for sources, targets in ((names[:3], names), (names, names[:3])):
+        m = distance_matrix(CAMPUS, sources, targets)
+        assert m.shape == (len(sources), len(targets))
+        for i, s in enumerate(sources):
+            for j, t in enumerate(targets):
+                assert m[i, j] == a_star(CAMPUS, s, t)[1]
+
+
+def test_asymmetric_graph_is_not_transposed():
+    g = CampusGraph.from_dict({'A': {'B': 1}, 'B': {'A': 5}})
+    assert not g.symmetric
+    assert distance_matrix(g, ['A', 'B'], ['A']).tolist() == [[0.0], [5.0]]
+    assert distance_matrix(g, ['B'], ['A']).tolist() == [[5.0]]
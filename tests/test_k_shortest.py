@@ -0,0 +1,35 @@
+import pytest
+
+from campus_graph import k_shortest_paths
+from graphs import path_cost, random_graph
+
+
+def _simple_paths(g, start, goal):
+    """Every loopless start -> goal path with its cost, by depth-first search."""
+    found = []
+
+    def walk(path):
+        u = path[-1]
+        if u == goal:
+            found.append(path_cost(g, path))
+            return
+        for v, w in g.adjacency(g.index[u]):
+            name = g.names[v]
+            if name not in path and w != float('inf'):
+                walk(path + [name])
+    walk([start])
+    return sorted(found)
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_yen_matches_brute_force(seed):
+    g = random_graph(seed, max_nodes=7)
+    start, goal = g.names[0], g.names[-1]
+    routes = k_shortest_paths(g, start, goal, k=4)
+    expected = _simple_paths(g, start, goal)[:4]
+    assert [cost for _, cost in routes] == expected
+    assert len({tuple(path) for path, _ in routes}) == len(routes)
+    for path, cost in routes:
+        assert path[0] == start and path[-1] == goal
+        assert len(set(path)) == len(path)
+        assert path_cost(g, path) == cost
@@ -0,0 +1,50 @@
+import pytest
+
+import benchmark
+import parallel
+from campus_graph import dijkstra_ids, first_hops
+from graphs import random_graph
+from route_table import RouteTable
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # small graphs normally run in-process; force the worker processes
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_NODES", 0)
+    g = benchmark.GENERATORS["geometric"](120, seed=3)
+    with parallel.GraphPool(g, workers=2) as p:
+        yield p
+
+
+def test_all_pairs_equals_serial(pool):
+    assert pool.parallel
+    g = pool.graph
+    dist, next_hop = pool.all_pairs()
+    assert pool._pool is not None  # the rows really came from worker processes
+    n = len(g)
+    for s in range(n):
+        d, parent = dijkstra_ids(g, s)
+        assert list(dist[s * n:(s + 1) * n]) == d
+        assert list(next_hop[s * n:(s + 1) * n]) == first_hops(d, parent, s)
+
+
+def test_routes_and_rebuild_after_edit(pool):
+    g = pool.graph
+    pairs = [(g.names[i], g.names[-1 - i]) for i in range(20)]
+    serial = RouteTable.build(g)
+    assert [cost for _, cost in pool.routes(pairs)] == [serial.path(a, b)[1] for a, b in pairs]
+    u, v, _ = next(iter(g.edges()))
+    g.close_edge(g.names[u], g.names[v])
+    snapshot = g.snapshot()
+    table = RouteTable.build(snapshot, pool=pool)
+    assert table.digest == snapshot.digest()
+    assert list(table.dist) == list(RouteTable.build(snapshot).dist)
+
+
+def test_zero_weights_in_workers(monkeypatch):
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_NODES", 0)
+    g = random_graph(7)
+    with parallel.GraphPool(g, workers=2) as p:
+        dist, next_hop = p.all_pairs()
+    serial = RouteTable.build(g)
+    assert list(dist) == list(serial.dist) and list(next_hop) == list(serial.next_hop)
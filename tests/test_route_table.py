@@ -0,0 +1,34 @@
+import pytest
+
+from campus_graph import CampusGraph, a_star
+from contraction import ContractionHierarchy
+from graphs import path_cost, random_graph
+from route_table import RouteTable
+
+
+# Zero-weight paths tie a node with its parent in the shortest-path tree
+
+ZERO = {'A': {'B': 0}, 'B': {'A': 0, 'S': 1}, 'S': {'B': 1}}
+
+
+def test_zero_weight_first_hops():
+    g = CampusGraph.from_dict(ZERO)
+    assert a_star(g, 'S', 'A') == (['S', 'B', 'A'], 1.0)
+    assert RouteTable.build(g).path('S', 'A') == (['S', 'B', 'A'], 1.0)
+    assert ContractionHierarchy.build(g).query('S', 'A') == (['S', 'B', 'A'], 1.0)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_engines_match_a_star(seed):
+    g = random_graph(seed)
+    table, ch = RouteTable.build(g), ContractionHierarchy.build(g)
+    for start in g.names:
+        for goal in g.names:
+            want = a_star(g, start, goal)[1]
+            for path, cost in (table.path(start, goal), ch.query(start, goal)):
+                assert cost == want
+                if want == float('inf'):
+                    assert path is None
+                else:
+                    assert path[0] == start and path[-1] == goal
+                    assert path_cost(g, path) == cost
@@ -0,0 +1,44 @@
+import pytest
+
+mysql = pytest.importorskip("mysql.connector")
+
+from db import RouteWriter
+
+
+class DownDB:
+    def save_routes(self, rows):
+        raise mysql.Error("MySQL is down")
+
+
+class PickyDB:
+    """Refuses rows whose source name is longer than 5 characters."""
+    def __init__(self):
+        self.rows = []
+
+    def save_routes(self, rows):
+        if any(len(row[1]) > 5 for row in rows):
+            raise mysql.DataError("Data too long for column 'name'")
+        self.rows.extend(rows)
+
+
+def test_save_after_torn_spool_survives_restart(tmp_path):
+    spool = tmp_path / "pending.jsonl"
+    spool.write_text('["u", "A", "B", ["A", "B"], "t"]\n["torn", "li', encoding="utf-8")
+    writer = RouteWriter(DownDB(), str(spool), interval=60)
+    writer.save("u", "X", "Y", ["X", "Y"])
+    writer.close(timeout=1)
+    writer = RouteWriter(DownDB(), str(spool), interval=60)
+    assert [row[1] for row in writer._pending] == ["A", "X"]
+    writer.close(timeout=1)
+
+
+def test_refused_row_is_set_aside(tmp_path):
+    db = PickyDB()
+    writer = RouteWriter(db, str(tmp_path / "pending.jsonl"), interval=60)
+    writer.save("u", "Too long", "Y", ["Too long", "Y"])
+    writer.save("u", "Lab", "Y", ["Lab", "Y"])
+    writer.flush()
+    writer.close()
+    assert [row[1] for row in db.rows] == ["Lab"]
+    assert writer.pending == 0 and writer.rejected == 1
+    assert "Too long" in open(writer.reject_path, encoding="utf-8").read()
@@ -0,0 +1,20 @@
+import math
+
+from campus_data import CAMPUS
+from spatial import SpatialIndex
+
+
+def test_nearest_matches_linear_scan():
+    idx = SpatialIndex(CAMPUS)
+    xs, ys = CAMPUS.xs, CAMPUS.ys
+    for x, y in ((410, 180), (0, 0), (800, 400), (-50, 500)):
+        best = min(math.hypot(xs[u] - x, ys[u] - y) for u in range(len(CAMPUS)))
+        u = idx.nearest(x, y)
+        assert math.hypot(xs[u] - x, ys[u] - y) == best
+
+
+def test_huge_coordinates_are_clamped():
+    idx = SpatialIndex(CAMPUS)
+    assert idx.nearest(1.7e308, 1.7e308) != -1
+    assert idx.nearest(-1.7e308, 0) != -1
+    assert len(idx.query(-1.7e308, -1.7e308, 1.7e308, 1.7e308)) == len(CAMPUS)